@@ -1,28 +1,86 @@
 """The Total Connect 2.0E integration."""
 from __future__ import annotations
 
+import asyncio
+from typing import Any
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.storage import Store
 
-from .const import DOMAIN, PLATFORMS
+from .const import DOMAIN, PLATFORMS, STORAGE_KEY, STORAGE_VERSION
 from .coordinator import TC20EUpdateCoordinator
+from .scheduler import async_release_scheduler
+
+# Unique id of the panel from before more than one account was supported.
+LEGACY_UNIQUE_ID = "domonial_alarm_panel_1"
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Total Connect 2.0E from a config entry."""
 
+    await async_migrate_unique_ids(hass, entry)
+
     coordinator = TC20EUpdateCoordinator(hass, entry)
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
-    await coordinator.async_config_entry_first_refresh()
+    await coordinator.async_restore_session()
+
+    async def async_close_coordinator(event: Event) -> None:
+        await coordinator.async_close()
 
     entry.async_on_unload(entry.add_update_listener(async_update_listener))
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_close_coordinator)
+    )
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # The TC20E website is slow, do not hold up startup waiting for it.
+    # The panel shows its restored state until the first refresh is done.
+    # With several accounts the first refreshes are spread out. Later polls
+    # follow each account's own interval, the scheduler's request cap keeps
+    # them from piling up.
+
+    async def async_first_refresh() -> None:
+        await asyncio.sleep(coordinator.refresh_offset)
+        await coordinator.async_refresh()
+
+    entry.async_create_background_task(
+        hass, async_first_refresh(), f"{DOMAIN} first refresh"
+    )
+
     return True
 
 
+async def async_migrate_unique_ids(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Move entities and device of this entry from the legacy to per entry ids."""
+
+    @callback
+    def migrate_entity(entity_entry: er.RegistryEntry) -> dict[str, Any] | None:
+        if not entity_entry.unique_id.startswith(LEGACY_UNIQUE_ID):
+            return None
+        return {
+            "new_unique_id": entity_entry.unique_id.replace(
+                LEGACY_UNIQUE_ID, entry.entry_id, 1
+            )
+        }
+
+    await er.async_migrate_entries(hass, entry.entry_id, migrate_entity)
+
+    device_registry = dr.async_get(hass)
+    if (
+        device := device_registry.async_get_device(
+            identifiers={(DOMAIN, LEGACY_UNIQUE_ID)}
+        )
+    ) and entry.entry_id in device.config_entries:
+        device_registry.async_update_device(
+            device.id, new_identifiers={(DOMAIN, entry.entry_id)}
+        )
+
+
 async def async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Update when config_entry options update."""
     await hass.config_entries.async_reload(entry.entry_id)
@@ -31,6 +89,13 @@ async def async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator: TC20EUpdateCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_close()
+        await async_release_scheduler(hass, entry.entry_id)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored session of a removed config entry."""
+    await Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry.entry_id}").async_remove()
@@ -10,12 +10,15 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     STATE_ALARM_ARMED_AWAY,
     STATE_ALARM_ARMED_HOME,
+    STATE_ALARM_ARMING,
     STATE_ALARM_DISARMED,
+    STATE_ALARM_DISARMING,
     STATE_ALARM_PENDING,
 )
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
@@ -28,6 +31,12 @@ ALARM_STATE_TO_HA_STATE = {
     0: STATE_ALARM_PENDING,
 }
 
+RESTORABLE_STATES = (
+    STATE_ALARM_ARMED_AWAY,
+    STATE_ALARM_ARMED_HOME,
+    STATE_ALARM_DISARMED,
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
@@ -35,11 +44,11 @@ async def async_setup_entry(
     """Set up alarm panel from config entry."""
 
     coordinator: TC20EUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
-    async_add_entities([TC20EAlarmPanel(coordinator)], False)
+    async_add_entities([TC20EAlarmPanel(coordinator, entry.entry_id)], False)
 
 
 class TC20EAlarmPanel(
-    CoordinatorEntity[TC20EUpdateCoordinator], AlarmControlPanelEntity
+    CoordinatorEntity[TC20EUpdateCoordinator], AlarmControlPanelEntity, RestoreEntity
 ):
     """TC20E, Domonial Alarm Panel."""
 
@@ -49,6 +58,7 @@ class TC20EAlarmPanel(
     def __init__(
         self,
         coordinator: TC20EUpdateCoordinator,
+        entry_id: str,
     ) -> None:
         """Initialize the Domonial Alarm panel."""
         super().__init__(coordinator)
@@ -59,10 +69,10 @@ class TC20EAlarmPanel(
         )
         self._attr_code_arm_required = False
         self._attr_code_format = None
-        self._attr_unique_id = "domonial_alarm_panel_1"
+        self._attr_unique_id = entry_id
         self._attr_state = ALARM_STATE_TO_HA_STATE[self.coordinator.alarmstatus]
         self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, "domonial_alarm_panel_1")},
+            identifiers={(DOMAIN, entry_id)},
             name="Domonial Alarm Panel",
             model="Domonial",
             manufacturer="Honeywell",
@@ -71,42 +81,69 @@ class TC20EAlarmPanel(
     @property
     def extra_state_attributes(self) -> dict:
         """Additional states for alarm panel."""
+        snapshot = self.coordinator.data
+        state_age = self.coordinator.state_age
         return {
             "display_name": self._displayname,
+            "last_refresh": self.coordinator.last_refresh,
+            "state_age": None if state_age is None else round(state_age),
+            "message": snapshot.message_key if snapshot else None,
+            "queue_depth": self.coordinator.queue.depth,
+            "queue_wait": round(self.coordinator.queue.last_wait, 2),
+            "circuit": self.coordinator.breaker.state,
+            "retry_in": self.coordinator.breaker.time_to_retry,
         }
 
+    async def async_added_to_hass(self) -> None:
+        """Restore last known state until the first refresh has completed."""
+        await super().async_added_to_hass()
+
+        if self.coordinator.alarmstatus:
+            return
+
+        if (
+            last_state := await self.async_get_last_state()
+        ) and last_state.state in RESTORABLE_STATES:
+            self._attr_state = last_state.state
+
     async def async_alarm_disarm(self, code=None) -> None:
         """Disarm alarm."""
         command = "disarm"
         await self.coordinator.setalarm(command)
-        if alarm_state := self.coordinator.alarmstatus:
-            self._attr_state = ALARM_STATE_TO_HA_STATE[alarm_state]
+        self._update_state()
         self.async_write_ha_state()
 
     async def async_alarm_arm_away(self, code=None) -> None:
         """Arm alarm away."""
         command = "full"
         await self.coordinator.setalarm(command)
-        if alarm_state := self.coordinator.alarmstatus:
-            self._attr_state = ALARM_STATE_TO_HA_STATE[alarm_state]
+        self._update_state()
         self.async_write_ha_state()
 
     async def async_alarm_arm_home(self, code=None) -> None:
         """Arm alarm away."""
         command = "partial"
         await self.coordinator.setalarm(command)
-        if alarm_state := self.coordinator.alarmstatus:
-            self._attr_state = ALARM_STATE_TO_HA_STATE[alarm_state]
+        self._update_state()
         self.async_write_ha_state()
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        if alarm_state := self.coordinator.alarmstatus:
-            self._attr_state = ALARM_STATE_TO_HA_STATE[alarm_state]
+        self._update_state()
         super()._handle_coordinator_update()
 
+    @callback
+    def _update_state(self) -> None:
+        """Show pending command, otherwise last known alarm status."""
+        if command := self.coordinator.pending_command:
+            self._attr_state = (
+                STATE_ALARM_DISARMING if command == "disarm" else STATE_ALARM_ARMING
+            )
+        elif alarm_state := self.coordinator.alarmstatus:
+            self._attr_state = ALARM_STATE_TO_HA_STATE[alarm_state]
+
     @property
     def available(self) -> bool:
-        """Return entity available."""
-        return True
+        """Return entity available until the alarm status is too old."""
+        return not self.coordinator.state_stale
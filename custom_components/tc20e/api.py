@@ -0,0 +1,335 @@
+"""Client for the TC20E website."""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from typing import Any
+
+import aiohttp
+from yarl import URL
+
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util.ssl import get_default_context
+
+from .const import DEFAULT_SESSION_TTL, LOGGER, TC20E_URL
+from .metrics import RequestMetrics
+from .rate_limiter import RateLimiter, ThrottledError
+
+TIMEOUT = 15
+
+CHUNK_SIZE = 4096
+
+LIMIT_PER_HOST = 8
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 120
+
+SESSION_ID_MARKER = b"homeSessionId='"
+SESSION_ID_PATTERN = re.compile(rb"homeSessionId='(.*?)'")
+
+
+async def async_extract_session_id(response: aiohttp.ClientResponse) -> str | None:
+    """Scan the home page body for the session id, stop reading once found."""
+
+    buffer = b""
+
+    try:
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            buffer += chunk
+
+            if match := SESSION_ID_PATTERN.search(buffer):
+                return match.group(1).decode()
+
+            # Only keep what could still be the start of a match split
+            # across chunks.
+            if (marker := buffer.rfind(SESSION_ID_MARKER)) != -1:
+                buffer = buffer[marker:]
+            else:
+                buffer = buffer[-(len(SESSION_ID_MARKER) - 1) :]
+
+    finally:
+        response.release()
+
+    return None
+
+
+class PoolStats:
+    """Connection pool counters for a TC20E client session."""
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.connector: aiohttp.TCPConnector | None = None
+
+    @property
+    def open_connections(self) -> int:
+        """Return connections held by the pool, idle or in use."""
+        if self.connector is None or self.connector.closed:
+            return 0
+        idle = getattr(self.connector, "_conns", {})
+        acquired = getattr(self.connector, "_acquired", ())
+        return sum(len(conns) for conns in idle.values()) + len(acquired)
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Return share of requests sent on an already open connection."""
+        total = self.connections_created + self.connections_reused
+        return round(self.connections_reused / total, 3) if total else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return counters for diagnostics."""
+        return {
+            "requests": self.requests,
+            "open_connections": self.open_connections,
+            # Every new connection is HTTPS, so each one costs a TLS handshake.
+            "tls_handshakes": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "reuse_ratio": self.reuse_ratio,
+        }
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Return trace config feeding these counters."""
+
+        async def on_request_start(*_: Any) -> None:
+            self.requests += 1
+
+        async def on_connection_create_end(*_: Any) -> None:
+            self.connections_created += 1
+
+        async def on_connection_reuseconn(*_: Any) -> None:
+            self.connections_reused += 1
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+
+@callback
+def async_create_tc20e_connector() -> aiohttp.TCPConnector:
+    """Create a keep-alive connection pool to the TC20E website."""
+
+    return aiohttp.TCPConnector(
+        limit_per_host=LIMIT_PER_HOST,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ssl=get_default_context(),
+    )
+
+
+@callback
+def async_create_tc20e_session(
+    connector: aiohttp.TCPConnector, limiter: RateLimiter
+) -> tuple[aiohttp.ClientSession, PoolStats]:
+    """Create a client session on a shared connection pool and rate limiter.
+
+    Every account gets its own session, and so its own cookie jar, but the
+    connections to the website and the request budget are shared.
+    """
+
+    stats = PoolStats()
+    stats.connector = connector
+
+    websession = aiohttp.ClientSession(
+        connector=connector,
+        connector_owner=False,
+        # Requests are bounded by asyncio.timeout. The session's own total
+        # timeout would leave its timer behind for every request the rate
+        # limiter refuses.
+        timeout=aiohttp.ClientTimeout(total=None),
+        trace_configs=[limiter.trace_config(), stats.trace_config()],
+    )
+    return websession, stats
+
+
+class TC20EClient:
+    """Logged in session on the TC20E website.
+
+    Created by the config flow to validate the credentials and handed over
+    to the coordinator, so the session is not thrown away after setup.
+    """
+
+    def __init__(
+        self,
+        auth_id: str,
+        connector: aiohttp.TCPConnector,
+        limiter: RateLimiter,
+        session_ttl: int = DEFAULT_SESSION_TTL,
+    ) -> None:
+        """Initialize the client."""
+        self.limiter = limiter
+        self.websession, self.pool_stats = async_create_tc20e_session(
+            connector, self.limiter
+        )
+        self.metrics = RequestMetrics()
+        self.session_id: str | None = None
+        self.session_ttl = session_ttl
+        self._auth_id = auth_id
+        self._session_used = 0.0
+
+    def touch(self) -> None:
+        """Mark the session as used now."""
+        self._session_used = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Forget the session, the next request logs in again."""
+        self.session_id = None
+
+    def export_session(self) -> dict[str, Any] | None:
+        """Return session token and cookies for storage."""
+
+        if self.session_id is None:
+            return None
+
+        cookies = self.websession.cookie_jar.filter_cookies(URL(TC20E_URL))
+        idle = time.monotonic() - self._session_used
+
+        return {
+            "session_id": self.session_id,
+            "cookies": {name: morsel.value for name, morsel in cookies.items()},
+            "last_used": time.time() - idle,
+        }
+
+    def import_session(self, data: dict[str, Any]) -> bool:
+        """Resume a stored session unless it has been idle for too long.
+
+        The session is not checked here, an expired one is detected by the
+        first request and replaced by a fresh login.
+        """
+
+        idle = time.time() - data["last_used"]
+
+        if idle >= self.session_ttl:
+            LOGGER.debug("Stored session idle for too long, not resuming")
+            return False
+
+        self.websession.cookie_jar.update_cookies(data["cookies"], URL(TC20E_URL))
+        self.session_id = data["session_id"]
+        self._session_used = time.monotonic() - idle
+
+        LOGGER.debug("Resumed stored session")
+        return True
+
+    async def async_ensure_session(self) -> None:
+        """Login unless a session within its idle TTL is available."""
+
+        if (
+            self.session_id is not None
+            and time.monotonic() - self._session_used < self.session_ttl
+        ):
+            LOGGER.debug("Reusing session")
+            return
+
+        if self.session_id is not None:
+            LOGGER.debug("Session idle for too long, logging in again")
+            self.session_id = None
+
+        try:
+            with self.metrics.measure("login"):
+                async with asyncio.timeout(TIMEOUT):
+                    await self._login()
+
+        except TimeoutError as error:
+            LOGGER.warning("Timeout during login %s", str(error))
+            raise CannotConnectError from error
+
+        except aiohttp.ClientError as error:
+            LOGGER.warning("Error during login %s", str(error))
+            raise CannotConnectError from error
+
+        self.touch()
+
+        LOGGER.debug("Login passed")
+
+    async def async_logout(self) -> None:
+        """Close the session held on the TC20E website."""
+
+        if self.session_id is None:
+            return
+
+        try:
+            await self._logout()
+        except (TimeoutError, aiohttp.ClientError, ThrottledError) as error:
+            LOGGER.debug("Logout failed: %s", error)
+            self.session_id = None
+
+    async def async_close(self, logout: bool = True) -> None:
+        """Close the client session, logout first unless asked not to."""
+
+        if logout:
+            await self.async_logout()
+        await self.websession.close()
+
+    async def _logout(self) -> None:
+        """Logout."""
+
+        LOGGER.debug("Logout")
+
+        with self.metrics.measure("logout"):
+            async with (
+                asyncio.timeout(TIMEOUT),
+                self.websession.get(f"{TC20E_URL}/logout"),
+            ):
+                pass
+        self.session_id = None
+
+    async def _login(self) -> None:
+        """Login and retrieve session id."""
+
+        LOGGER.debug("Trying to login")
+
+        async with asyncio.timeout(TIMEOUT):
+            async with self.websession.get(TC20E_URL):
+                pass
+
+            async with self.websession.get(
+                f"{TC20E_URL}/validate",
+                headers={
+                    "Authorization": self._auth_id,
+                },
+            ) as response:
+                response_text = await response.text()
+
+        if response_text != "#1home":
+            LOGGER.error("Auth failure %s, status %s", response_text, response.status)
+            self.session_id = None
+            raise AuthenticationError
+
+        async with self.websession.get(f"{TC20E_URL}/go/home") as response:
+            self.session_id = await async_extract_session_id(response)
+
+        if self.session_id is None:
+            LOGGER.error("Failed to retrieve Session ID: %d", response.status)
+            await self._logout()
+            raise CannotConnectError
+
+        LOGGER.debug("Session id retrieved")
+
+
+class UnauthorizedError(HomeAssistantError):
+    """Exception to indicate an error in authorization."""
+
+
+class CannotConnectError(HomeAssistantError):
+    """Exception to indicate an error in client connection."""
+
+
+class OperationError(HomeAssistantError):
+    """Exception to indicate an error in operation."""
+
+
+class AuthenticationError(HomeAssistantError):
+    """Error to indicate authentication failure."""
+
+
+class SessionExpiredError(HomeAssistantError):
+    """Error to indicate the session on the TC20E website is no longer valid."""
+
+
+class InvalidResponseError(HomeAssistantError):
+    """Error to indicate the TC20E website sent an unexpected response."""
@@ -0,0 +1,88 @@
+"""Circuit breaker for the TC20E integration."""
+
+from __future__ import annotations
+
+import time
+
+from .const import LOGGER
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stop calling the TC20E website after consecutive connection failures."""
+
+    def __init__(
+        self, threshold: int, reset_timeout: float, max_reset_timeout: float
+    ) -> None:
+        """Initialize the breaker."""
+        self._threshold = threshold
+        self._reset_timeout = reset_timeout
+        self._max_reset_timeout = max_reset_timeout
+        self._timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """Return breaker state."""
+        if self._opened_at is None:
+            return STATE_CLOSED
+        if self._probing or self.time_to_retry == 0:
+            return STATE_HALF_OPEN
+        return STATE_OPEN
+
+    @property
+    def time_to_retry(self) -> float:
+        """Return seconds until a probe request is let through."""
+        if self._opened_at is None:
+            return 0
+        return max(0, round(self._opened_at + self._timeout - time.monotonic(), 1))
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent now."""
+
+        if self._opened_at is None:
+            return True
+
+        if self._probing or self.time_to_retry > 0:
+            return False
+
+        LOGGER.debug("Circuit half open, sending probe request")
+        self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        """Close the breaker after the website answered."""
+
+        if self._opened_at is not None:
+            LOGGER.info("TC20E website reachable again, closing circuit")
+
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._timeout = self._reset_timeout
+
+    def record_failure(self) -> None:
+        """Count a connection failure, open the breaker at the threshold."""
+
+        self._failures += 1
+
+        if self._probing:
+            self._probing = False
+            self._timeout = min(self._timeout * 2, self._max_reset_timeout)
+        elif self._opened_at is not None or self._failures < self._threshold:
+            return
+
+        LOGGER.warning(
+            "TC20E website unreachable, pausing requests for %s seconds",
+            self._timeout,
+        )
+        self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Let another probe through when the current one ended without result."""
+        self._probing = False
@@ -0,0 +1,113 @@
+"""Request queue for the TC20E integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import heapq
+import itertools
+import time
+from typing import Any, TypeVar
+
+from .const import LOGGER
+
+_T = TypeVar("_T")
+
+PRIORITY_COMMAND = 0
+PRIORITY_STATUS = 1
+
+
+class CommandQueue:
+    """Run requests one at a time, commands before status polls."""
+
+    def __init__(self) -> None:
+        """Initialize the queue."""
+        self._busy = False
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._counter = itertools.count()
+        self._inflight: dict[str, asyncio.Task[Any]] = {}
+        self.last_wait: float = 0.0
+        self.max_wait: float = 0.0
+        self.coalesced: int = 0
+
+    @property
+    def depth(self) -> int:
+        """Return number of requests waiting for the slot."""
+        return sum(1 for _, _, waiter in self._waiters if not waiter.done())
+
+    @property
+    def busy(self) -> bool:
+        """Return True if a request holds the slot."""
+        return self._busy
+
+    async def async_run(
+        self,
+        priority: int,
+        job: Callable[[], Awaitable[_T]],
+        coalesce_key: str | None = None,
+    ) -> _T:
+        """Run job when the slot is free.
+
+        Calls sharing a coalesce_key while one is queued or running get the
+        result of that call instead of issuing their own.
+        """
+
+        if coalesce_key is None:
+            return await self._run(priority, job)
+
+        if (task := self._inflight.get(coalesce_key)) is None:
+            task = asyncio.get_running_loop().create_task(self._run(priority, job))
+            self._inflight[coalesce_key] = task
+            task.add_done_callback(
+                lambda _: self._inflight.pop(coalesce_key, None)
+            )
+        else:
+            LOGGER.debug("Joining request already in flight: %s", coalesce_key)
+            self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    async def _run(self, priority: int, job: Callable[[], Awaitable[_T]]) -> _T:
+        await self._acquire(priority)
+        try:
+            return await job()
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: int) -> None:
+        start = time.monotonic()
+
+        if not self._busy and not self._waiters:
+            self._busy = True
+            self.last_wait = 0.0
+            return
+
+        LOGGER.debug("Another request session in progress, waiting")
+
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._counter), waiter)
+        heapq.heappush(self._waiters, entry)
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was handed over just before cancellation, pass it on.
+                self._release()
+            elif entry in self._waiters:
+                # Not yet popped by _release, take it out of the queue.
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+            raise
+
+        self.last_wait = time.monotonic() - start
+        self.max_wait = max(self.max_wait, self.last_wait)
+
+    def _release(self) -> None:
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+        self._busy = False
@@ -3,70 +3,68 @@
 from __future__ import annotations
 
 import base64
-import re
 from typing import Any
 
-from bs4 import BeautifulSoup
 import voluptuous as vol
 
 from homeassistant import config_entries, core, exceptions
 from homeassistant.const import CONF_AUTHENTICATION, CONF_PASSWORD, CONF_USERNAME
 from homeassistant.data_entry_flow import FlowResult
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import DOMAIN, LOGGER, TC20E_URL
-
-
-async def validate_input(hass: core.HomeAssistant, auth_id: str) -> None:
-    """Validate the user input allows us to connect."""
-
-    async def logout():
-        await websession.get(
-            f"{TC20E_URL}/logout",
-            headers={
-                "Connection": "keep-alive",
-            },
-        )
-
-    websession = async_get_clientsession(hass)
-
-    await websession.get(TC20E_URL)
-
-    response = await websession.get(
-        f"{TC20E_URL}/validate",
-        headers={
-            "Authorization": auth_id,
-        },
-    )
-
-    response_text = await response.text()
-
-    if response_text != "#1home":
-        LOGGER.error("Auth failure %s, status %s", response_text, response.status)
-        raise AuthenticationError
-
-    response = await websession.get(
-        f"{TC20E_URL}/go/home",
-        headers={
-            "Connection": "keep-alive",
-        },
-    )
-    response_text = await response.text()
-    soup = BeautifulSoup(response_text, "html.parser")
+from .api import (
+    AuthenticationError as TC20EAuthenticationError,
+    CannotConnectError,
+    TC20EClient,
+)
+from .const import (
+    CONF_BURST_INTERVAL,
+    CONF_BURST_WINDOW,
+    CONF_COMPLETION_DEADLINE,
+    CONF_RATE_BURST,
+    CONF_RATE_LIMIT,
+    CONF_SESSION_TTL,
+    CONF_STALE_AFTER,
+    CONF_STATE_MAX_AGE,
+    DATA_CLIENTS,
+    DEFAULT_BURST_INTERVAL,
+    DEFAULT_BURST_WINDOW,
+    DEFAULT_COMPLETION_DEADLINE,
+    DEFAULT_RATE_BURST,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_SESSION_TTL,
+    DEFAULT_STALE_AFTER,
+    DEFAULT_STATE_MAX_AGE,
+    DOMAIN,
+    LOGGER,
+    MAX_SCAN_INTERVAL,
+    MIN_SCAN_INTERVAL,
+    UPDATE_INTERVAL,
+)
+from .rate_limiter import ThrottledError
+from .scheduler import async_get_scheduler, async_release_scheduler
+
+
+async def validate_input(hass: core.HomeAssistant, auth_id: str) -> TC20EClient:
+    """Validate the user input allows us to connect.
+
+    Returns the logged in client, so the coordinator can reuse its session.
+    """
+
+    scheduler = async_get_scheduler(hass)
+    client = TC20EClient(auth_id, scheduler.connector, scheduler.limiter)
 
     try:
-        session_id = re.search(r"homeSessionId='(.*?)'", soup.prettify()).group(1)
-    except AttributeError:
-        LOGGER.error("Failed to retrieve Session ID: %d", response.status)
-        await logout()
-        raise CannotConnect from AttributeError
-
-    if response.status not in (200, 204) or session_id is None:
-        LOGGER.error("Failed to login to retrieve Session ID: %d", response.status)
-        await logout()
-        raise CannotConnect
+        await client.async_ensure_session()
+    except TC20EAuthenticationError as error:
+        await client.async_close()
+        await async_release_scheduler(hass)
+        raise AuthenticationError from error
+    except (CannotConnectError, ThrottledError) as error:
+        await client.async_close()
+        await async_release_scheduler(hass)
+        raise CannotConnect from error
 
-    await logout()
+    return client
 
 
 class TC20EConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -76,6 +74,14 @@ class TC20EConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     entry: config_entries.ConfigEntry | None
 
+    @staticmethod
+    @core.callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> TC20EOptionsFlow:
+        """Get the options flow for this handler."""
+        return TC20EOptionsFlow(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -90,15 +96,17 @@ class TC20EConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             auth_id = base64.b64encode(auth_id.encode("utf-8"))
             auth_id = f"Basic {auth_id.decode('utf-8')}"
 
+            await self.async_set_unique_id(username)
+            self._abort_if_unique_id_configured()
+
             try:
-                await validate_input(self.hass, auth_id)
+                client = await validate_input(self.hass, auth_id)
             except CannotConnect:
                 errors = {"base": "connection_error"}
             except AuthenticationError:
                 errors = {"base": "auth_error"}
             else:
-                await self.async_set_unique_id(username)
-                self._abort_if_unique_id_configured()
+                self.hass.data.setdefault(DATA_CLIENTS, {})[auth_id] = client
 
                 LOGGER.debug("Login succesful. Config entry created")
                 return self.async_create_entry(
@@ -117,6 +125,70 @@ class TC20EConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
 
+class TC20EOptionsFlow(config_entries.OptionsFlow):
+    """Handle TC20E options."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize TC20E options flow."""
+        self.entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.entry.options
+        data_schema = vol.Schema(
+            {
+                vol.Optional(
+                    UPDATE_INTERVAL,
+                    default=options.get(UPDATE_INTERVAL, MIN_SCAN_INTERVAL),
+                ): vol.All(
+                    vol.Coerce(int),
+                    vol.Range(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL),
+                ),
+                vol.Optional(
+                    CONF_BURST_INTERVAL,
+                    default=options.get(CONF_BURST_INTERVAL, DEFAULT_BURST_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+                vol.Optional(
+                    CONF_BURST_WINDOW,
+                    default=options.get(CONF_BURST_WINDOW, DEFAULT_BURST_WINDOW),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_SESSION_TTL,
+                    default=options.get(CONF_SESSION_TTL, DEFAULT_SESSION_TTL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_COMPLETION_DEADLINE,
+                    default=options.get(
+                        CONF_COMPLETION_DEADLINE, DEFAULT_COMPLETION_DEADLINE
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+                vol.Optional(
+                    CONF_STATE_MAX_AGE,
+                    default=options.get(CONF_STATE_MAX_AGE, DEFAULT_STATE_MAX_AGE),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_STALE_AFTER,
+                    default=options.get(CONF_STALE_AFTER, DEFAULT_STALE_AFTER),
+                ): vol.All(vol.Coerce(int), vol.Range(min=MIN_SCAN_INTERVAL)),
+                vol.Optional(
+                    CONF_RATE_LIMIT,
+                    default=options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(
+                    CONF_RATE_BURST,
+                    default=options.get(CONF_RATE_BURST, DEFAULT_RATE_BURST),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            }
+        )
+
+        return self.async_show_form(step_id="init", data_schema=data_schema)
+
+
 class CannotConnect(exceptions.HomeAssistantError):
     """Error to indicate we cannot connect."""
 
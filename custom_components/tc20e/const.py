@@ -7,12 +7,40 @@ import logging
 from homeassistant.const import Platform
 
 DOMAIN = "tc20e"
+DATA_CLIENTS = f"{DOMAIN}_clients"
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+EVENT_TC20E = f"{DOMAIN}_event"
+
+STORAGE_KEY = DOMAIN
+STORAGE_VERSION = 1
 
 LOGGER = logging.getLogger(__package__)
 
 MIN_SCAN_INTERVAL = 180
+MAX_SCAN_INTERVAL = 1800
 UPDATE_INTERVAL = "timesync"
 
+CONF_BURST_INTERVAL = "burst_interval"
+DEFAULT_BURST_INTERVAL = 15
+CONF_BURST_WINDOW = "burst_window"
+DEFAULT_BURST_WINDOW = 120
+
+CONF_SESSION_TTL = "session_ttl"
+DEFAULT_SESSION_TTL = 600
+CONF_COMPLETION_DEADLINE = "completion_deadline"
+DEFAULT_COMPLETION_DEADLINE = 60
+
+CONF_STATE_MAX_AGE = "state_max_age"
+DEFAULT_STATE_MAX_AGE = 60
+
+CONF_STALE_AFTER = "stale_after"
+DEFAULT_STALE_AFTER = 900
+
+CONF_RATE_LIMIT = "rate_limit"
+DEFAULT_RATE_LIMIT = 30
+CONF_RATE_BURST = "rate_burst"
+DEFAULT_RATE_BURST = 10
+
 TC20E_URL = "https://tc20e.total-connect.eu"
 
-PLATFORMS = [Platform.ALARM_CONTROL_PANEL]
+PLATFORMS = [Platform.ALARM_CONTROL_PANEL, Platform.SENSOR]
@@ -3,113 +3,570 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import timedelta
-import re
+from collections import deque
+from datetime import datetime, timedelta
+import random
+import time
+from typing import Any
 
 import aiohttp
-from bs4 import BeautifulSoup
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_AUTHENTICATION
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-
-from .const import DOMAIN, LOGGER, MIN_SCAN_INTERVAL, TC20E_URL
-
-TIMEOUT = 15
-
-
-class TC20EUpdateCoordinator(DataUpdateCoordinator):
+from homeassistant.util import dt as dt_util
+
+from .api import (
+    TIMEOUT,
+    CannotConnectError,
+    InvalidResponseError,
+    SessionExpiredError,
+    TC20EClient,
+)
+from .circuit_breaker import CircuitBreaker
+from .command_queue import PRIORITY_COMMAND, PRIORITY_STATUS, CommandQueue
+from .const import (
+    CONF_BURST_INTERVAL,
+    CONF_BURST_WINDOW,
+    CONF_COMPLETION_DEADLINE,
+    CONF_RATE_BURST,
+    CONF_RATE_LIMIT,
+    CONF_SESSION_TTL,
+    CONF_STALE_AFTER,
+    CONF_STATE_MAX_AGE,
+    DATA_CLIENTS,
+    DEFAULT_BURST_INTERVAL,
+    DEFAULT_BURST_WINDOW,
+    DEFAULT_COMPLETION_DEADLINE,
+    DEFAULT_RATE_BURST,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_SESSION_TTL,
+    DEFAULT_STALE_AFTER,
+    DEFAULT_STATE_MAX_AGE,
+    DOMAIN,
+    EVENT_TC20E,
+    LOGGER,
+    MAX_SCAN_INTERVAL,
+    MIN_SCAN_INTERVAL,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+    TC20E_URL,
+    UPDATE_INTERVAL,
+)
+from .models import CommandAccepted, CommandStatus, PanelSnapshot
+from .rate_limiter import ThrottledError
+from .scheduler import async_get_scheduler
+
+# statusCode, messageKey and errorCode of a completed command.
+CommandResult = tuple[int, str | None, int | None]
+
+SESSION_INVALID_STATUS = (401, 403)
+
+STORE_SAVE_DELAY = 10
+
+EVENT_LOG_SIZE = 50
+
+COMMANDS = {
+    "full": ("arm", 101),
+    "partial": ("partialarm", 102),
+    "disarm": ("disarm", 100),
+}
+
+COMPLETION_TERMINAL_CODES = (2, 6)
+# Budget for login, command and status of one operation, commands get the
+# completion deadline on top. The logout after a timed out operation is
+# not part of it and may take up to TIMEOUT more.
+OPERATION_TIMEOUT = 45
+
+COMPLETION_FIRST_PROBE = 0.25
+COMPLETION_MAX_PROBE = 5.0
+COMPLETION_BACKOFF = 2.0
+COMPLETION_JITTER = 0.2
+
+# Notify listeners slightly after the status turned stale, not just before.
+STALE_CHECK_MARGIN = 1
+
+BREAKER_THRESHOLD = 3
+BREAKER_RESET_TIMEOUT = 60
+BREAKER_MAX_RESET_TIMEOUT = 900
+
+
+class TC20EUpdateCoordinator(DataUpdateCoordinator[PanelSnapshot]):
     """TC20E Coordinator."""
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize the TC20E Coordinator."""
 
-        self.websession = async_get_clientsession(hass)
         self._authid: str = entry.data[CONF_AUTHENTICATION]
-        self._session_id: str | None = None
-        self._timesync = MIN_SCAN_INTERVAL
+        self.scheduler = async_get_scheduler(hass)
+        self.refresh_offset = self.scheduler.async_register(entry.entry_id)
+        # Reuse the session the config flow just logged in with, if any.
+        self.client: TC20EClient = hass.data.get(DATA_CLIENTS, {}).pop(
+            self._authid, None
+        ) or TC20EClient(
+            self._authid, self.scheduler.connector, self.scheduler.limiter
+        )
+        self.client.session_ttl = entry.options.get(
+            CONF_SESSION_TTL, DEFAULT_SESSION_TTL
+        )
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry.entry_id}", private=True
+        )
+        self._stored_session_id: str | None = None
+        self.scheduler.async_set_rate_limit(
+            entry.entry_id,
+            entry.options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+            entry.options.get(CONF_RATE_BURST, DEFAULT_RATE_BURST),
+        )
+        self.pool_stats = self.client.pool_stats
+        self.metrics = self.client.metrics
+        self._completion_deadline: int = entry.options.get(
+            CONF_COMPLETION_DEADLINE, DEFAULT_COMPLETION_DEADLINE
+        )
+        self.completion_stats: dict[str, dict[str, float | int]] = {}
+        self._timesync: int = entry.options.get(UPDATE_INTERVAL, MIN_SCAN_INTERVAL)
+        self._burst_interval: int = entry.options.get(
+            CONF_BURST_INTERVAL, DEFAULT_BURST_INTERVAL
+        )
+        self._burst_window: int = entry.options.get(
+            CONF_BURST_WINDOW, DEFAULT_BURST_WINDOW
+        )
+        self._burst_until: float = 0.0
+        self._failures = 0
         self.alarmstatus = 0
-        self.request = False
+        self.pending_command: str | None = None
+        self._inflight_commands: dict[
+            str, tuple[asyncio.Task[None], asyncio.Future[None]]
+        ] = {}
+        self._state_max_age: int = entry.options.get(
+            CONF_STATE_MAX_AGE, DEFAULT_STATE_MAX_AGE
+        )
+        self._confirmed_at: float | None = None
+        self._started = time.monotonic()
+        self._unsub_stale: CALLBACK_TYPE | None = None
+        self._stale_after: int = entry.options.get(
+            CONF_STALE_AFTER, DEFAULT_STALE_AFTER
+        )
+        self.cache_stats = {"hits": 0, "misses": 0, "deduplicated": 0}
+        self._phase: str | None = None
+        self.last_refresh: datetime | None = None
+        self.events: deque[dict[str, Any]] = deque(maxlen=EVENT_LOG_SIZE)
+        self._event_cursor: tuple[int, str | None] | None = None
+        self._entry_id = entry.entry_id
+        self._closing = False
+        self.queue = CommandQueue()
+        self.breaker = CircuitBreaker(
+            BREAKER_THRESHOLD, BREAKER_RESET_TIMEOUT, BREAKER_MAX_RESET_TIMEOUT
+        )
 
         super().__init__(
             hass,
             LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=MIN_SCAN_INTERVAL),
+            update_interval=timedelta(seconds=self._timesync),
         )
 
+        self._schedule_stale_check()
+
     async def setalarm(self, command: str) -> None:
-        """Change status of alarm."""
+        """Change status of alarm, return once the panel accepted the command.
+
+        Completion is tracked in the background, pending_command is set until
+        the panel reports the command done or failed. Commands for the state
+        the panel was recently confirmed in are skipped, and a command that is
+        already in flight is joined instead of sent again.
+        """
+
+        if (inflight := self._inflight_commands.get(command)) is not None:
+            LOGGER.debug("Command %s already in flight, joining it", command)
+            self.cache_stats["deduplicated"] += 1
+            task, accepted = inflight
+
+        elif (
+            self.pending_command is None
+            and self.alarmstatus == COMMANDS[command][1]
+            and (age := self.state_age) is not None
+            and age < self._state_max_age
+        ):
+            LOGGER.debug("Alarm already in requested state, skipping %s", command)
+            self.cache_stats["hits"] += 1
+            return
 
-        try:
-            if command == "full":
-                await self._request(
-                    TC20E_URL + "/applicationservice/domoweb/panel/commands/arm"
-                )
-                self.alarmstatus = 101
+        else:
+            self.cache_stats["misses"] += 1
+            accepted = self.hass.loop.create_future()
 
-            if command == "partial":
-                await self._request(
-                    TC20E_URL + "/applicationservice/domoweb/panel/commands/partialarm"
-                )
-                self.alarmstatus = 102
+            self.pending_command = command
+            self.async_update_listeners()
+
+            task = self.hass.async_create_background_task(
+                self._async_track_command(command, accepted), f"{DOMAIN} {command}"
+            )
+            self._inflight_commands[command] = (task, accepted)
+            task.add_done_callback(
+                lambda _: self._inflight_commands.pop(command, None)
+            )
+
+        await asyncio.wait((accepted, task), return_when=asyncio.FIRST_COMPLETED)
 
-            if command == "disarm":
-                await self._request(
-                    TC20E_URL + "/applicationservice/domoweb/panel/commands/disarm"
+        if not accepted.done():
+            if task.cancelled():
+                # Cancelled by async_close, not by the caller.
+                raise HomeAssistantError(
+                    f"TC20E {command} command cancelled, integration unloading"
                 )
-                self.alarmstatus = 100
+            # Failed, or completed without asking for completion polling.
+            task.result()
+
+    @property
+    def inflight_commands(self) -> list[str]:
+        """Return commands currently being sent or completed."""
+        return list(self._inflight_commands)
+
+    @property
+    def state_age(self) -> float | None:
+        """Return seconds since the alarm status was last confirmed."""
+        if self._confirmed_at is None:
+            return None
+        return time.monotonic() - self._confirmed_at
+
+    @property
+    def state_stale(self) -> bool:
+        """Return True if the alarm status has not been confirmed for too long.
+
+        Until then the last confirmed (or restored) status is served while
+        refreshes keep being retried in the background.
+        """
+        reference = self._started if self._confirmed_at is None else self._confirmed_at
+        return time.monotonic() - reference > self._stale_after
+
+    @callback
+    def _schedule_stale_check(self) -> None:
+        """Notify listeners when the alarm status turns stale.
+
+        Repeated failed refreshes do not notify listeners, without this the
+        panel would not become unavailable during a long outage.
+        """
+
+        if self._unsub_stale is not None:
+            self._unsub_stale()
+
+        reference = self._started if self._confirmed_at is None else self._confirmed_at
+        delay = reference + self._stale_after - time.monotonic() + STALE_CHECK_MARGIN
+        self._unsub_stale = async_call_later(
+            self.hass, max(delay, 0), self._async_handle_stale
+        )
 
-        except (UpdateFailed, ConfigEntryAuthFailed, CannotConnectError) as error:
-            raise HomeAssistantError(
-                f"Could not arm/disarm TC20E on error {error!s}"
-            ) from error
+    @callback
+    def _async_handle_stale(self, _: datetime) -> None:
+        """Update listeners now that the alarm status is stale."""
+
+        self._unsub_stale = None
+        LOGGER.warning(
+            "TC20E alarm status not confirmed for %s seconds", self._stale_after
+        )
+        self.async_update_listeners()
 
-        # await self.async_request_refresh()
+    async def _async_track_command(
+        self, command: str, accepted: asyncio.Future[None]
+    ) -> None:
+        """Send command and reconcile alarm status when it completes."""
 
-    async def _async_update_data(self) -> None:
+        path, alarmstatus = COMMANDS[command]
+        previous = self.alarmstatus
+
+        try:
+            await self._request(
+                TC20E_URL + "/applicationservice/domoweb/panel/commands/" + path,
+                accepted=accepted,
+            )
+
+        except (
+            UpdateFailed,
+            ConfigEntryAuthFailed,
+            CannotConnectError,
+            ThrottledError,
+        ) as error:
+            LOGGER.debug("Command %s failed, rolling back", command)
+            self.alarmstatus = previous
+
+            if not accepted.done():
+                raise HomeAssistantError(
+                    f"Could not arm/disarm TC20E on error {error!s}"
+                ) from error
+
+            LOGGER.error("Could not arm/disarm TC20E on error %s", error)
+            self._schedule_refresh()
+            self._async_log_event("command_failed", command=command, error=str(error))
+            return
+
+        else:
+            self.alarmstatus = alarmstatus
+            self._confirmed_at = time.monotonic()
+            self._schedule_stale_check()
+            self._update_poll_interval(changed=True)
+            self._schedule_refresh()
+            self._async_log_event("command", command=command)
+
+        finally:
+            if self.pending_command == command:
+                self.pending_command = None
+            self.async_update_listeners()
+
+    async def _async_update_data(self) -> PanelSnapshot:
         """Fetch info from TC20E."""
 
         LOGGER.debug("Trying to get Alarm status")
 
+        previous = self.alarmstatus
+
         try:
-            await self._request(
-                TC20E_URL + "/applicationservice/domoweb/panel/commands/status"
+            statuscode, messagekey, _ = await self._request(
+                TC20E_URL + "/applicationservice/domoweb/panel/commands/status",
+                PRIORITY_STATUS,
             )
 
-        except (UpdateFailed, ConfigEntryAuthFailed, CannotConnectError) as error:
+        except (
+            UpdateFailed,
+            ConfigEntryAuthFailed,
+            CannotConnectError,
+            ThrottledError,
+        ) as error:
+            self._update_poll_interval(failed=True)
             raise HomeAssistantError(
                 f"Could not retrieve alarm status on error {error!s}"
             ) from error
 
-        # await self.async_request_refresh()
+        except HomeAssistantError:
+            self._update_poll_interval(failed=True)
+            raise
+
+        self.last_refresh = dt_util.utcnow()
+        self._confirmed_at = time.monotonic()
+        self._schedule_stale_check()
+        self._update_poll_interval(changed=previous != self.alarmstatus)
+
+        if (self.alarmstatus, messagekey) != self._event_cursor:
+            if self._event_cursor is not None:
+                previous = self._event_cursor[0]
+            self._event_cursor = (self.alarmstatus, messagekey)
+            self._store.async_delay_save(self._export_state, STORE_SAVE_DELAY)
+            self._async_log_event(
+                "status",
+                previous=previous,
+                alarmstatus=self.alarmstatus,
+                message=messagekey,
+            )
+
+        return PanelSnapshot(
+            alarmstatus=self.alarmstatus,
+            status_code=statuscode,
+            message_key=messagekey,
+            updated=self.last_refresh,
+        )
 
-    async def _request(self, url: str) -> None:
-        if self.request is True:
-            LOGGER.debug("Another request session in progress, waiting")
+    @callback
+    def _async_log_event(self, event_type: str, **data: Any) -> None:
+        """Keep an event in the log and fire it on the event bus."""
 
-            while self.request is True:
-                await asyncio.sleep(1)
-                LOGGER.debug("Trying again")
+        event = {"type": event_type, "time": dt_util.utcnow().isoformat(), **data}
+        self.events.append(event)
+        self.hass.bus.async_fire(EVENT_TC20E, {"entry_id": self._entry_id, **event})
 
-        self.request = True
+    def _update_poll_interval(
+        self, changed: bool = False, failed: bool = False
+    ) -> None:
+        """Poll faster after a state change, back off while stable or failing."""
+
+        now = time.monotonic()
+
+        if changed:
+            self._burst_until = now + self._burst_window
+
+        if failed:
+            self._failures += 1
+            interval = min(self._timesync * 2**self._failures, MAX_SCAN_INTERVAL)
+        elif now < self._burst_until:
+            self._failures = 0
+            interval = self._burst_interval
+        else:
+            self._failures = 0
+            interval = min(self.update_interval.total_seconds() * 2, self._timesync)
+
+        LOGGER.debug("Next status poll in %s seconds", interval)
+        self.update_interval = timedelta(seconds=interval)
+
+    def _export_state(self) -> dict[str, Any]:
+        """Return session and event cursor for storage."""
+
+        data = self.client.export_session() or {}
+        if self._event_cursor is not None:
+            data["event_cursor"] = list(self._event_cursor)
+        return data
+
+    async def async_restore_session(self) -> None:
+        """Resume the session and event cursor stored before the last restart.
+
+        Status events are only fired for changes since the stored cursor.
+        """
+
+        if not (data := await self._store.async_load()):
+            return
+
+        if (cursor := data.get("event_cursor")) is not None:
+            self._event_cursor = (cursor[0], cursor[1])
+
+        if self.client.session_id is None and "session_id" in data:
+            self.client.import_session(data)
+            self._stored_session_id = self.client.session_id
+
+    async def async_close(self) -> None:
+        """Store the session and event cursor and close the client session.
+
+        The session is kept open on the website so it can be resumed after a
+        restart or reload.
+        """
+
+        self._closing = True
+
+        if self._unsub_stale is not None:
+            self._unsub_stale()
+            self._unsub_stale = None
+
+        if tasks := [task for task, _ in self._inflight_commands.values()]:
+            for task in tasks:
+                task.cancel()
+            # Let them finish before storing the session they used.
+            await asyncio.wait(tasks)
+
+        if data := self._export_state():
+            await self._store.async_save(data)
+        else:
+            await self._store.async_remove()
+
+        await self.client.async_close(logout=False)
+
+    async def _request(
+        self,
+        url: str,
+        priority: int = PRIORITY_COMMAND,
+        accepted: asyncio.Future[None] | None = None,
+    ) -> CommandResult:
+        operation = "poll" if priority == PRIORITY_STATUS else "command"
+
+        async def send() -> CommandResult:
+            # Runs once per request sent, callers joining a coalesced status
+            # poll share its result and its effect on the breaker.
+            if not self.breaker.allow():
+                raise CircuitOpenError(
+                    "TC20E website unreachable, retrying in "
+                    f"{self.breaker.time_to_retry}s"
+                )
+
+            try:
+                # Cap concurrent requests over all TC20E accounts.
+                async with self.scheduler.semaphore:
+                    result = await self._send(url, operation, accepted)
+
+            except CannotConnectError:
+                self.breaker.record_failure()
+                raise
+
+            except (asyncio.CancelledError, ThrottledError):
+                # Not sent, says nothing about the website being reachable.
+                self.breaker.release()
+                raise
+
+            except Exception:
+                # The website answered, it is reachable.
+                self.breaker.record_success()
+                raise
+
+            self.breaker.record_success()
+            return result
+
+        return await self.queue.async_run(
+            priority,
+            send,
+            coalesce_key=url if priority == PRIORITY_STATUS else None,
+        )
+
+    async def _send(
+        self, url: str, operation: str, accepted: asyncio.Future[None] | None
+    ) -> CommandResult:
+        """Send request on the current session, login again if it expired.
+
+        The whole operation shares one deadline. When it runs out, or the
+        operation is cancelled, the session is logged out as it may have been
+        left halfway through a command. That logout has its own request
+        timeout, so it can overrun the deadline by up to TIMEOUT seconds.
+        It is skipped when the coordinator is closing, the session is stored
+        then to be resumed after the restart or reload.
+        """
+
+        budget = OPERATION_TIMEOUT
+        if operation == "command":
+            budget += self._completion_deadline
 
         try:
-            async with asyncio.timeout(TIMEOUT):
-                await self._login()
+            with self.metrics.measure(operation) as sample:
+                async with asyncio.timeout(budget):
+                    self._phase = "login"
+                    await self.client.async_ensure_session()
+
+                    try:
+                        result = await self._command(url, accepted=accepted)
+
+                    except SessionExpiredError:
+                        LOGGER.debug("Session no longer valid, logging in again")
+                        sample.retries += 1
+                        self.client.invalidate()
+                        self._phase = "login"
+                        await self.client.async_ensure_session()
+                        result = await self._command(
+                            url, retry=False, accepted=accepted
+                        )
 
         except TimeoutError as error:
-            LOGGER.warning("Timeout during login %s", str(error))
-            self.request = False
-            raise CannotConnectError from error
+            LOGGER.warning(
+                "TC20E %s exceeded its %s second budget during %s",
+                operation,
+                budget,
+                self._phase,
+            )
+            await asyncio.shield(self.client.async_logout())
+            raise CannotConnectError(
+                f"{operation} timed out after {budget}s during {self._phase}"
+            ) from error
+
+        except asyncio.CancelledError:
+            LOGGER.debug("TC20E %s cancelled during %s", operation, self._phase)
+            if not self._closing:
+                await asyncio.shield(self.client.async_logout())
+            raise
+
+        self.client.touch()
+
+        if self.client.session_id != self._stored_session_id:
+            self._stored_session_id = self.client.session_id
+            self._store.async_delay_save(self._export_state, STORE_SAVE_DELAY)
+
+        return result
 
-        LOGGER.debug("Login passed")
+    async def _command(
+        self,
+        url: str,
+        retry: bool = True,
+        accepted: asyncio.Future[None] | None = None,
+    ) -> CommandResult:
+        """Send command and wait for the panel to complete it."""
 
         headers = {
-            "x-session-token": self._session_id,
+            "x-session-token": self.client.session_id,
         }
         params = {
             "isBusy": "true",
@@ -120,210 +577,183 @@ class TC20EUpdateCoordinator(DataUpdateCoordinator):
             "value": "",
         }
 
-        try:
-            async with asyncio.timeout(TIMEOUT):
-                response = await self.websession.put(
-                    url, headers=headers, params=params, json=json
-                )
+        self._phase = "command"
 
-        except TimeoutError as error:
-            LOGGER.warning("Timeout when sending command to TC20E")
-            await self._logout()
-            raise CannotConnectError from error
-
-        except Exception as error:
-            LOGGER.debug("Exception on request: %s", error)
-            await self._logout()
-            raise UpdateFailed from error
-
-        LOGGER.debug("Command response status: %s", response.status)
-
-        if response.status == 200:
+        with self.metrics.measure("put") as sample:
             try:
-                json = await response.json()
-                json_id = json["id"]
-                json_status = json["status"]
-
-            except aiohttp.ContentTypeError as error:
-                LOGGER.debug("ContentTypeError on ok status: %s", error.message)
-                response_text = await response.text()
-                LOGGER.debug("Response (200) text is: %s", response_text)
-                await self._logout()
-                raise UpdateFailed from error
+                async with asyncio.timeout(TIMEOUT):
+                    response = await self.client.websession.put(
+                        url, headers=headers, params=params, json=json
+                    )
 
-            if json_status == "success":
-                LOGGER.debug("Command successfull, URL: %s", url)
+            except TimeoutError as error:
+                LOGGER.warning("Timeout when sending command to TC20E")
+                raise CannotConnectError from error
 
-                statuscode = 0
+            except aiohttp.ClientConnectionError as error:
+                LOGGER.debug("Connection error on request: %s", error)
+                raise CannotConnectError from error
 
-                while statuscode != 2:
-                    try:
-                        async with asyncio.timeout(TIMEOUT):
-                            response = await self.websession.get(
-                                url + "/" + str(json_id) + "/status",
-                                headers=headers,
-                            )
+            except ThrottledError:
+                raise
 
-                    except TimeoutError as error:
-                        LOGGER.warning("Timeout when sending command to TC20E")
-                        await self._logout()
-                        raise CannotConnectError from error
+            except Exception as error:
+                LOGGER.debug("Exception on request: %s", error)
+                raise UpdateFailed from error
 
-                    except Exception as error:
-                        LOGGER.debug("Exception on request: %s", error)
-                        await self._logout()
-                        raise UpdateFailed from error
+            async with response:
+                sample.status = response.status
+                LOGGER.debug("Command response status: %s", response.status)
 
-                    if response.status == 200:
-                        LOGGER.debug("Command response status: %s", response.status)
+                if response.status in SESSION_INVALID_STATUS and retry:
+                    raise SessionExpiredError
 
-                        try:
-                            json = await response.json()
-                            statuscode = json["statusCode"]
-                            messagekey = json["messageKey"]
-                            errorcode = json["errorCode"]
+                body = await response.read()
 
-                        except aiohttp.ContentTypeError as error:
-                            LOGGER.debug(
-                                "ContentTypeError on ok status: %s", error.message
-                            )
-                            response_text = await response.text()
-                            LOGGER.debug("Response (200) text is: %s", response_text)
-                            await self._logout()
-                            raise UpdateFailed from error
+        if response.status not in (200, 201):
+            LOGGER.debug("Did not retrieve information properly")
+            LOGGER.debug("request status: %s", response.status)
+            LOGGER.debug("request text: %s", body)
+            raise UpdateFailed
 
-                        LOGGER.debug("Command response Status Code: %s", statuscode)
+        model = CommandAccepted if response.status == 200 else CommandStatus
 
-                    await asyncio.sleep(1)
+        try:
+            result = model.from_body(body)
 
-                    if statuscode == 6:
-                        LOGGER.debug("Status code is 6 -> Toolong, aborting")
-                        await self._logout()
-                        self.alarmstatus = 0
-                        raise UpdateFailed
+        except InvalidResponseError as error:
+            LOGGER.debug("Invalid response (%s): %s", response.status, error)
+            # The website answers an expired session with its login page.
+            if retry and response.status == 200:
+                raise SessionExpiredError from error
+            raise UpdateFailed from error
 
-            LOGGER.debug("Status Code is: %s", statuscode)
-            LOGGER.debug("Error Code is: %s", errorcode)
-            LOGGER.debug("Message is: %s", messagekey)
+        LOGGER.debug("Response: %s", result.raw)
 
-            if errorcode is not None:
-                self.alarmstatus = errorcode
+        if isinstance(result, CommandAccepted):
+            if result.status != "success":
+                LOGGER.debug("Command not accepted, status: %s", result.status)
+                raise UpdateFailed
 
-            await self._logout()
+            LOGGER.debug("Command successfull, URL: %s", url)
 
-            return
+            if accepted is not None and not accepted.done():
+                accepted.set_result(None)
 
-        if response.status == 201:
-            try:
-                json = await response.json()
-                statuscode = json["statusCode"]
-                messagekey = json["messageKey"]
-                errorcode = json["errorCode"]
-
-            except aiohttp.ContentTypeError as error:
-                LOGGER.debug("ContentTypeError on ok status: %s", error.message)
-                response_text = await response.text()
-                LOGGER.debug("Response (200) text is: %s", response_text)
-                await self._logout()
-                raise UpdateFailed from error
+            statuscode, messagekey, errorcode = await self._wait_for_completion(
+                url, result.command_id, headers
+            )
+
+        else:
+            statuscode = result.status_code
+            messagekey = result.message_key
+            errorcode = result.error_code
 
             if statuscode == 6:
                 LOGGER.debug("Status code is 6 -> Toolong, aborting")
-                await self._logout()
-                self.alarmstatus = 0
                 raise UpdateFailed
 
-            LOGGER.debug("Status Code is: %s", statuscode)
-            LOGGER.debug("Error Code is: %s", errorcode)
-            LOGGER.debug("Message is: %s", messagekey)
+        LOGGER.debug("Status Code is: %s", statuscode)
+        LOGGER.debug("Error Code is: %s", errorcode)
+        LOGGER.debug("Message is: %s", messagekey)
 
-            if errorcode is not None:
-                self.alarmstatus = errorcode
-
-            await self._logout()
-            return
+        if errorcode is not None:
+            self.alarmstatus = errorcode
 
-        LOGGER.debug("Did not retrieve information properly")
-        LOGGER.debug("request status: %s", response.status)
-        response_text = await response.text()
-        LOGGER.debug("request text: %s", response_text)
-        await self._logout()
-        raise UpdateFailed
+        return statuscode, messagekey, errorcode
 
-    async def _logout(self) -> None:
-        """Logout."""
-
-        LOGGER.debug("Logout")
-
-        async with asyncio.timeout(TIMEOUT):
-            await self.websession.get(
-                f"{TC20E_URL}/logout",
-                headers={
-                    "Connection": "keep-alive",
-                },
-            )
-        self._session_id = None
-        self.request = False
+    async def _wait_for_completion(
+        self, url: str, json_id: int, headers: dict[str, str | None]
+    ) -> CommandResult:
+        """Poll command status with backoff until the panel completes it."""
 
-    async def _login(self) -> None:
-        """Login and retrieve session id."""
+        self._phase = "completion"
+        command = url.rsplit("/", 1)[-1]
+        delay = COMPLETION_FIRST_PROBE
+        probes = 0
+        start = time.monotonic()
+        statuscode = 0
+        messagekey = None
+        errorcode = None
 
-        LOGGER.debug("Trying to login")
+        try:
+            with self.metrics.measure("completion") as sample:
+                async with asyncio.timeout(self._completion_deadline) as deadline:
+                    while True:
+                        probes += 1
+
+                        async with (
+                            asyncio.timeout(TIMEOUT),
+                            self.client.websession.get(
+                                url + "/" + str(json_id) + "/status",
+                                headers=headers,
+                            ) as response,
+                        ):
+                            LOGGER.debug("Command response status: %s", response.status)
 
-        async with asyncio.timeout(TIMEOUT):
-            await self.websession.get(TC20E_URL)
+                            if response.status in SESSION_INVALID_STATUS:
+                                self.client.invalidate()
+                                raise UpdateFailed
 
-            response = await self.websession.get(
-                f"{TC20E_URL}/validate",
-                headers={
-                    "Authorization": self._authid,
-                },
-            )
+                            if response.status == 200:
+                                status = CommandStatus.from_body(
+                                    await response.read()
+                                )
+                                statuscode = status.status_code
+                                messagekey = status.message_key
+                                errorcode = status.error_code
 
-        response_text = await response.text()
+                                LOGGER.debug(
+                                    "Command response Status Code: %s", statuscode
+                                )
 
-        if response_text != "#1home":
-            LOGGER.error("Auth failure %s, status %s", response_text, response.status)
-            self._session_id = None
-            raise AuthenticationError
+                        if statuscode in COMPLETION_TERMINAL_CODES:
+                            break
 
-        response = await self.websession.get(
-            f"{TC20E_URL}/go/home",
-            headers={
-                "Connection": "keep-alive",
-            },
-        )
-        response_text = await response.text()
-        soup = BeautifulSoup(response_text, "html.parser")
-
-        try:
-            self._session_id = re.search(
-                r"homeSessionId='(.*?)'", soup.prettify()
-            ).group(1)
-        except AttributeError:
-            LOGGER.error("Failed to retrieve Session ID: %d", response.status)
-            await self._logout()
-            raise CannotConnectError from AttributeError
+                        jitter = random.uniform(-COMPLETION_JITTER, COMPLETION_JITTER)
+                        await asyncio.sleep(delay * (1 + jitter))
+                        delay = min(delay * COMPLETION_BACKOFF, COMPLETION_MAX_PROBE)
 
-        if self._session_id is None:
-            LOGGER.error("Failed to retrieve Session ID: %d", response.status)
-            await self._logout()
-            raise CannotConnectError
+        except TimeoutError as error:
+            if deadline.expired():
+                # The website kept answering, the panel is just slow.
+                LOGGER.warning("Timeout waiting for TC20E to complete %s", command)
+                raise CompletionTimeoutError(
+                    f"{command} not completed within {self._completion_deadline}s"
+                ) from error
+
+            LOGGER.warning("Timeout polling TC20E for completion of %s", command)
+            raise CannotConnectError from error
 
-        LOGGER.debug("Session id retrieved")
+        except aiohttp.ClientConnectionError as error:
+            LOGGER.debug("Connection error on request: %s", error)
+            raise CannotConnectError from error
 
+        except (aiohttp.ClientError, InvalidResponseError) as error:
+            LOGGER.debug("Exception on request: %s", error)
+            raise UpdateFailed from error
 
-class UnauthorizedError(HomeAssistantError):
-    """Exception to indicate an error in authorization."""
+        finally:
+            sample.probes = probes
+            self.completion_stats[command] = {
+                "probes": probes,
+                "duration": round(time.monotonic() - start, 2),
+                "status_code": statuscode,
+            }
+            LOGGER.debug(
+                "Completion of %s: %s", command, self.completion_stats[command]
+            )
 
+        if statuscode == 6:
+            LOGGER.debug("Status code is 6 -> Toolong, aborting")
+            raise UpdateFailed
 
-class CannotConnectError(HomeAssistantError):
-    """Exception to indicate an error in client connection."""
+        return statuscode, messagekey, errorcode
 
 
-class OperationError(HomeAssistantError):
-    """Exception to indicate an error in operation."""
+class CircuitOpenError(CannotConnectError):
+    """Error to indicate requests are paused after repeated connection failures."""
 
 
-class AuthenticationError(HomeAssistantError):
-    """Error to indicate authentication failure."""
+class CompletionTimeoutError(UpdateFailed):
+    """Error to indicate the panel did not complete a command in time."""
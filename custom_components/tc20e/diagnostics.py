@@ -0,0 +1,43 @@
+"""Diagnostics support for the TC20E integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import TC20EUpdateCoordinator
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+
+    coordinator: TC20EUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "options": dict(entry.options),
+        "alarmstatus": coordinator.alarmstatus,
+        "last_refresh": coordinator.last_refresh,
+        "update_interval": coordinator.update_interval.total_seconds(),
+        "queue": {
+            "depth": coordinator.queue.depth,
+            "last_wait": coordinator.queue.last_wait,
+            "max_wait": coordinator.queue.max_wait,
+            "coalesced": coordinator.queue.coalesced,
+        },
+        "circuit": {
+            "state": coordinator.breaker.state,
+            "retry_in": coordinator.breaker.time_to_retry,
+        },
+        "completion": coordinator.completion_stats,
+        "command_cache": coordinator.cache_stats,
+        "inflight_commands": coordinator.inflight_commands,
+        "connection_pool": coordinator.pool_stats.as_dict(),
+        "rate_limiter": coordinator.scheduler.limiter.as_dict(),
+        "timings": coordinator.metrics.as_dict(),
+        "events": list(coordinator.events),
+    }
@@ -0,0 +1,104 @@
+"""Request timing metrics for the TC20E integration."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+import time
+from typing import Any
+
+METRICS_SIZE = 100
+HISTOGRAM_BUCKETS = (0.5, 1, 2, 5, 10, 20, 40, 60)
+
+
+class PhaseSample:
+    """Timing of one phase of a request."""
+
+    __slots__ = ("phase", "start", "duration", "status", "probes", "retries", "error")
+
+    def __init__(self, phase: str) -> None:
+        """Initialize the sample."""
+        self.phase = phase
+        self.start = time.time()
+        self.duration: float | None = None
+        self.status: int | None = None
+        self.probes: int | None = None
+        self.retries = 0
+        self.error: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return sample for diagnostics."""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+class RequestMetrics:
+    """Ring buffers of phase timings with rolling latency statistics."""
+
+    def __init__(self, size: int = METRICS_SIZE) -> None:
+        """Initialize the ring buffers."""
+        self._size = size
+        self._samples: dict[str, deque[PhaseSample]] = {}
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[PhaseSample]:
+        """Time the wrapped block and store it as a sample of phase."""
+
+        sample = PhaseSample(phase)
+        start = time.monotonic()
+
+        try:
+            yield sample
+        except BaseException as error:
+            sample.error = type(error).__name__
+            raise
+        finally:
+            sample.duration = round(time.monotonic() - start, 3)
+            self._samples.setdefault(phase, deque(maxlen=self._size)).append(sample)
+
+    def last(self, phase: str) -> PhaseSample | None:
+        """Return the most recent sample of phase."""
+        if samples := self._samples.get(phase):
+            return samples[-1]
+        return None
+
+    def percentile(self, phase: str, percent: float) -> float | None:
+        """Return the duration percentile of successful samples of phase."""
+
+        durations = sorted(
+            sample.duration
+            for sample in self._samples.get(phase, ())
+            if sample.error is None and sample.duration is not None
+        )
+        if not durations:
+            return None
+
+        index = min(len(durations) - 1, round(percent / 100 * (len(durations) - 1)))
+        return durations[index]
+
+    def histogram(self, phase: str) -> dict[str, int]:
+        """Return count of samples of phase per latency bucket."""
+
+        counts = dict.fromkeys([*map(str, HISTOGRAM_BUCKETS), "+Inf"], 0)
+        for sample in self._samples.get(phase, ()):
+            bucket = next(
+                (str(le) for le in HISTOGRAM_BUCKETS if sample.duration <= le),
+                "+Inf",
+            )
+            counts[bucket] += 1
+        return counts
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return statistics and recent samples for diagnostics."""
+
+        return {
+            phase: {
+                "count": len(samples),
+                "errors": sum(1 for sample in samples if sample.error is not None),
+                "p50": self.percentile(phase, 50),
+                "p95": self.percentile(phase, 95),
+                "histogram": self.histogram(phase),
+                "samples": [sample.as_dict() for sample in samples],
+            }
+            for phase, samples in self._samples.items()
+        }
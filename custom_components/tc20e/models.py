@@ -0,0 +1,88 @@
+"""Data models for the TC20E integration."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+import logging
+from typing import Any
+
+from homeassistant.util.json import json_loads
+
+from .api import InvalidResponseError
+from .const import LOGGER
+
+
+@dataclass(slots=True)
+class PanelSnapshot:
+    """State of the panel from one status refresh."""
+
+    alarmstatus: int
+    status_code: int | None
+    message_key: str | None
+    updated: datetime
+
+
+def _decode(body: bytes) -> tuple[dict[str, Any], bytes | None]:
+    """Decode a JSON body, return it with the raw body kept for debugging."""
+
+    try:
+        data = json_loads(body)
+    except ValueError as error:
+        raise InvalidResponseError(f"Response is not JSON: {body[:100]!r}") from error
+
+    if not isinstance(data, dict):
+        raise InvalidResponseError(f"Unexpected response: {body[:100]!r}")
+
+    return data, body if LOGGER.isEnabledFor(logging.DEBUG) else None
+
+
+class CommandAccepted:
+    """Answer to a command the website accepted and is still running."""
+
+    __slots__ = ("command_id", "status", "raw")
+
+    def __init__(self, command_id: int, status: str, raw: bytes | None) -> None:
+        """Initialize the response."""
+        self.command_id = command_id
+        self.status = status
+        self.raw = raw
+
+    @classmethod
+    def from_body(cls, body: bytes) -> CommandAccepted:
+        """Decode the response from its raw body."""
+
+        data, raw = _decode(body)
+        try:
+            return cls(data["id"], data["status"], raw)
+        except KeyError as error:
+            raise InvalidResponseError(f"Missing {error} in {body[:100]!r}") from error
+
+
+class CommandStatus:
+    """Completion status of a command, or the status of the panel."""
+
+    __slots__ = ("status_code", "message_key", "error_code", "raw")
+
+    def __init__(
+        self,
+        status_code: int,
+        message_key: str | None,
+        error_code: int | None,
+        raw: bytes | None,
+    ) -> None:
+        """Initialize the response."""
+        self.status_code = status_code
+        self.message_key = message_key
+        self.error_code = error_code
+        self.raw = raw
+
+    @classmethod
+    def from_body(cls, body: bytes) -> CommandStatus:
+        """Decode the response from its raw body."""
+
+        data, raw = _decode(body)
+        try:
+            return cls(data["statusCode"], data["messageKey"], data["errorCode"], raw)
+        except KeyError as error:
+            raise InvalidResponseError(f"Missing {error} in {body[:100]!r}") from error
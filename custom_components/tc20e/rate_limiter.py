@@ -0,0 +1,131 @@
+"""Rate limiter for the TC20E integration."""
+
+from __future__ import annotations
+
+import asyncio
+from email.utils import parsedate_to_datetime
+import time
+from typing import Any
+
+import aiohttp
+
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .const import LOGGER
+
+RETRY_AFTER_STATUS = (429, 503)
+MAX_RETRY_AFTER = 300
+# Longest wait for a token, well below the timeout of the request it delays.
+MAX_TOKEN_WAIT = 5
+
+
+class RateLimiter:
+    """Token bucket shared by all requests to the TC20E website.
+
+    Requests that would have to wait longer than MAX_TOKEN_WAIT, or that
+    are held back by a Retry-After header, fail with ThrottledError instead
+    of waiting inside their request timeout.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Initialize the limiter, rate in requests per minute."""
+        self._rate = rate / 60
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self.throttled = 0
+        self.deferred = 0
+
+    def configure(self, rate: float, burst: int) -> None:
+        """Change rate (requests per minute) and burst size."""
+        self._rate = rate / 60
+        self._burst = burst
+        self._tokens = min(self._tokens, burst)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return counters for diagnostics."""
+        return {
+            "rate_per_minute": self._rate * 60,
+            "burst": self._burst,
+            "tokens": round(self._tokens, 2),
+            "blocked_for": max(0, round(self._blocked_until - time.monotonic(), 1)),
+            "throttled": self.throttled,
+            "deferred": self.deferred,
+        }
+
+    async def async_acquire(self) -> None:
+        """Wait until a request may be sent, raise if that takes too long."""
+
+        if (wait := self._blocked_until - time.monotonic()) > 0:
+            LOGGER.debug("TC20E asked to retry in %.1f seconds", wait)
+            self.deferred += 1
+            raise ThrottledError(f"TC20E asked to retry in {wait:.0f}s")
+
+        self._refill()
+
+        if self._tokens < 1:
+            wait = (1 - self._tokens) / self._rate
+            if wait > MAX_TOKEN_WAIT:
+                LOGGER.debug("Rate limit reached, next request in %.1f seconds", wait)
+                self.deferred += 1
+                raise ThrottledError(f"Rate limit reached, retry in {wait:.0f}s")
+
+            LOGGER.debug("Rate limit reached, waiting %.1f seconds", wait)
+            self.throttled += 1
+            # Take the token now, so concurrent requests queue up behind it.
+            self._tokens -= 1
+            await asyncio.sleep(wait)
+            return
+
+        self._tokens -= 1
+
+    def retry_after(self, value: str) -> None:
+        """Hold back all requests as asked by a Retry-After header."""
+
+        try:
+            seconds = float(value)
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(value)
+                seconds = (retry_at - dt_util.utcnow()).total_seconds()
+            except (TypeError, ValueError):
+                LOGGER.debug("Invalid Retry-After header: %s", value)
+                return
+
+        seconds = min(max(seconds, 0), MAX_RETRY_AFTER)
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Return trace config applying the limiter to every request."""
+
+        async def on_request_start(*_: Any) -> None:
+            await self.async_acquire()
+
+        async def on_request_end(
+            session: aiohttp.ClientSession,
+            context: Any,
+            params: aiohttp.TraceRequestEndParams,
+        ) -> None:
+            response = params.response
+            if response.status in RETRY_AFTER_STATUS and (
+                value := response.headers.get("Retry-After")
+            ):
+                self.retry_after(value)
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_end)
+        return trace_config
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+
+class ThrottledError(HomeAssistantError):
+    """Error to indicate a request was held back by the rate limiter."""
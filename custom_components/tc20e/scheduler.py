@@ -0,0 +1,113 @@
+"""Scheduler shared by all TC20E config entries."""
+
+from __future__ import annotations
+
+import asyncio
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+
+from .api import async_create_tc20e_connector
+from .const import (
+    DATA_CLIENTS,
+    DATA_SCHEDULER,
+    DEFAULT_RATE_BURST,
+    DEFAULT_RATE_LIMIT,
+    LOGGER,
+    MIN_SCAN_INTERVAL,
+)
+from .rate_limiter import RateLimiter
+
+MAX_CONCURRENT_REQUESTS = 2
+STAGGER_OFFSET = 20
+
+
+class TC20EScheduler:
+    """Spread polls of all TC20E accounts, share their pool and rate limit."""
+
+    def __init__(self) -> None:
+        """Initialize the scheduler."""
+        self.connector = async_create_tc20e_connector()
+        self.limiter = RateLimiter(DEFAULT_RATE_LIMIT, DEFAULT_RATE_BURST)
+        self.semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self._slots: dict[str, int] = {}
+        self._rate_limits: dict[str, tuple[int, int]] = {}
+        self.unsub_close: CALLBACK_TYPE | None = None
+
+    def async_register(self, entry_id: str) -> int:
+        """Add a config entry, return the delay of its first refresh."""
+
+        used = set(self._slots.values())
+        slot = next(slot for slot in range(len(used) + 1) if slot not in used)
+        self._slots[entry_id] = slot
+
+        offset = slot * STAGGER_OFFSET % MIN_SCAN_INTERVAL
+        LOGGER.debug("Polls of %s offset by %s seconds", entry_id, offset)
+        return offset
+
+    def async_unregister(self, entry_id: str | None) -> bool:
+        """Remove a config entry, return True if it was the last one."""
+        self._slots.pop(entry_id, None)
+        if self._rate_limits.pop(entry_id, None) and self._rate_limits:
+            self._configure_limiter()
+        return not self._slots
+
+    def async_set_rate_limit(self, entry_id: str, rate: int, burst: int) -> None:
+        """Set the rate limit of a config entry, the strictest one applies."""
+        self._rate_limits[entry_id] = (rate, burst)
+        self._configure_limiter()
+
+    def _configure_limiter(self) -> None:
+        rates, bursts = zip(*self._rate_limits.values())
+        self.limiter.configure(min(rates), min(bursts))
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> TC20EScheduler:
+    """Return the scheduler, create it for the first config entry."""
+
+    if (scheduler := hass.data.get(DATA_SCHEDULER)) is None:
+        scheduler = hass.data[DATA_SCHEDULER] = TC20EScheduler()
+
+        async def async_close_connector(event: Event) -> None:
+            scheduler.unsub_close = None
+            await _async_close_clients(hass)
+            await scheduler.connector.close()
+
+        scheduler.unsub_close = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, async_close_connector
+        )
+
+    return scheduler
+
+
+async def async_release_scheduler(
+    hass: HomeAssistant, entry_id: str | None = None
+) -> None:
+    """Unregister a config entry, close the pool once no entry uses it.
+
+    Without entry_id, as after a failed config flow login, the pool is only
+    closed if no config entry was using it and no client handed over by
+    another config flow is waiting for its entry to be set up.
+    """
+
+    if (scheduler := hass.data.get(DATA_SCHEDULER)) is None:
+        return
+
+    if entry_id is None and hass.data.get(DATA_CLIENTS):
+        return
+
+    if scheduler.async_unregister(entry_id):
+        hass.data.pop(DATA_SCHEDULER)
+        if scheduler.unsub_close is not None:
+            scheduler.unsub_close()
+        await _async_close_clients(hass)
+        await scheduler.connector.close()
+
+
+async def _async_close_clients(hass: HomeAssistant) -> None:
+    """Logout clients handed over by a config flow whose entry was never set up."""
+
+    for client in hass.data.pop(DATA_CLIENTS, {}).values():
+        LOGGER.debug("Closing client of a config entry that was not set up")
+        await client.async_close()
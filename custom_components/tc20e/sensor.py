@@ -0,0 +1,112 @@
+"""Diagnostic sensors for TC20E integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import TC20EUpdateCoordinator
+
+
+@dataclass(frozen=True, kw_only=True)
+class TC20ESensorEntityDescription(SensorEntityDescription):
+    """Describes TC20E sensor entity."""
+
+    value_fn: Callable[[TC20EUpdateCoordinator], float | int | None]
+
+
+def _last_duration(phase: str) -> Callable[[TC20EUpdateCoordinator], float | None]:
+    def value(coordinator: TC20EUpdateCoordinator) -> float | None:
+        if sample := coordinator.metrics.last(phase):
+            return sample.duration
+        return None
+
+    return value
+
+
+SENSOR_TYPES: tuple[TC20ESensorEntityDescription, ...] = (
+    TC20ESensorEntityDescription(
+        key="last_poll_latency",
+        name="Last poll latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_last_duration("poll"),
+    ),
+    TC20ESensorEntityDescription(
+        key="last_command_latency",
+        name="Last command latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_last_duration("command"),
+    ),
+    TC20ESensorEntityDescription(
+        key="p95_command_latency",
+        name="Command latency p95",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.metrics.percentile("command", 95),
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up sensors from config entry."""
+
+    coordinator: TC20EUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities(
+        TC20ESensor(coordinator, entry.entry_id, description)
+        for description in SENSOR_TYPES
+    )
+
+
+class TC20ESensor(CoordinatorEntity[TC20EUpdateCoordinator], SensorEntity):
+    """TC20E diagnostic sensor."""
+
+    entity_description: TC20ESensorEntityDescription
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: TC20EUpdateCoordinator,
+        entry_id: str,
+        description: TC20ESensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{entry_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry_id)},
+        )
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self.coordinator)
+
+    @property
+    def available(self) -> bool:
+        """Return entity available."""
+        return True
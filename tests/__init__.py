@@ -0,0 +1,39 @@
+"""Tests for the Total Connect 2.0E integration."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.tc20e.const import DOMAIN
+from custom_components.tc20e.coordinator import TC20EUpdateCoordinator
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+
+async def async_setup_integration(
+    hass: HomeAssistant, entry: MockConfigEntry, wait_first_refresh: bool = True
+) -> TC20EUpdateCoordinator:
+    """Set up a config entry, return its coordinator after the first refresh."""
+
+    tasks: list[asyncio.Task[Any]] = []
+    create_background_task = entry.async_create_background_task
+
+    def async_create_background_task(*args: Any, **kwargs: Any) -> asyncio.Task[Any]:
+        tasks.append(task := create_background_task(*args, **kwargs))
+        return task
+
+    with patch.object(
+        entry, "async_create_background_task", async_create_background_task
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    if wait_first_refresh:
+        await asyncio.gather(*tasks)
+        await hass.async_block_till_done()
+
+    return hass.data[DOMAIN][entry.entry_id]
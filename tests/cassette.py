@@ -0,0 +1,205 @@
+"""Record exchanges with the TC20E website into cassettes and replay them.
+
+A cassette is a JSON file listing, in order, each request sent to the website
+with its answer and timing. Credentials, cookies and the session id are not
+recorded, the session id is replaced by a placeholder in the answers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import json
+from pathlib import Path
+import time
+from typing import Any
+
+import aiohttp
+from aiohttp import web
+
+from custom_components.tc20e.api import SESSION_ID_PATTERN
+
+CASSETTE_VERSION = 1
+SESSION_ID_PLACEHOLDER = "SESSION_ID"
+# Response headers the integration reads, all others are left out.
+KEPT_HEADERS = ("Content-Type", "Location", "Retry-After")
+# Request headers set by the recorder itself, not forwarded upstream.
+DROPPED_HEADERS = ("Host", "Content-Length", "Cookie", "Accept-Encoding")
+
+
+class Cassette:
+    """Exchanges with the website, in the order they were sent."""
+
+    def __init__(
+        self, interactions: list[dict[str, Any]], recorded_from: str = ""
+    ) -> None:
+        """Initialize the cassette."""
+        self.interactions = interactions
+        self.recorded_from = recorded_from
+
+    @property
+    def requests(self) -> list[str]:
+        """Return the recorded requests, as "METHOD /path"."""
+        return [interaction["request"] for interaction in self.interactions]
+
+    @property
+    def duration(self) -> float:
+        """Return seconds from the first request to the last answer."""
+        return max(
+            (
+                interaction["offset"] + interaction["elapsed"]
+                for interaction in self.interactions
+            ),
+            default=0.0,
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> Cassette:
+        """Load a cassette from a file."""
+
+        data = json.loads(path.read_text())
+        if data["version"] != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version {data['version']}")
+        return cls(data["interactions"], data.get("recorded_from", ""))
+
+    def save(self, path: Path) -> None:
+        """Write the cassette to a file, one interaction per line."""
+
+        lines = ",\n".join(
+            f"    {json.dumps(interaction)}" for interaction in self.interactions
+        )
+        path.write_text(
+            f'{{\n  "version": {CASSETTE_VERSION},\n'
+            f'  "recorded_from": {json.dumps(self.recorded_from)},\n'
+            f'  "interactions": [\n{lines}\n  ]\n}}\n'
+        )
+
+
+class CassetteRecorder:
+    """Proxy to the website recording every exchange into a cassette.
+
+    The proxy keeps the website's cookies itself, so the integration can be
+    pointed at it from a local address.
+    """
+
+    def __init__(self, upstream: str, recorded_from: str = "") -> None:
+        """Initialize the recorder."""
+        self.upstream = upstream.rstrip("/")
+        self.cassette = Cassette([], recorded_from or self.upstream)
+        self._secrets: set[str] = set()
+        self._start: float | None = None
+        self._session: aiohttp.ClientSession | None = None
+
+    def app(self) -> web.Application:
+        """Return the web application proxying to the website."""
+
+        app = web.Application()
+        app.router.add_route("*", "/{path:.*}", self._proxy)
+        return app
+
+    async def async_close(self) -> None:
+        """Close the connections to the website."""
+        if self._session is not None:
+            await self._session.close()
+
+    def _sanitize(self, text: str) -> str:
+        if match := SESSION_ID_PATTERN.search(text.encode()):
+            self._secrets.add(match.group(1).decode())
+        for secret in self._secrets:
+            text = text.replace(secret, SESSION_ID_PLACEHOLDER)
+        return text
+
+    async def _proxy(self, request: web.Request) -> web.Response:
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                cookie_jar=aiohttp.CookieJar(unsafe=True)
+            )
+        self._secrets.update(
+            value
+            for header in ("Authorization", "x-session-token")
+            if (value := request.headers.get(header))
+        )
+        headers = {
+            name: value
+            for name, value in request.headers.items()
+            if name not in DROPPED_HEADERS
+        }
+
+        start = time.monotonic()
+        if self._start is None:
+            self._start = start
+
+        async with self._session.request(
+            request.method,
+            self.upstream + request.path_qs,
+            headers=headers,
+            data=await request.read(),
+            allow_redirects=False,
+        ) as response:
+            body = await response.read()
+        elapsed = time.monotonic() - start
+
+        kept = {
+            name: response.headers[name].replace(self.upstream, "")
+            for name in KEPT_HEADERS
+            if name in response.headers
+        }
+        self.cassette.interactions.append(
+            {
+                "request": f"{request.method} {request.path}",
+                "status": response.status,
+                "headers": kept,
+                "body": self._sanitize(body.decode(errors="replace")),
+                "offset": round(start - self._start, 4),
+                "elapsed": round(elapsed, 4),
+            }
+        )
+        return web.Response(status=response.status, body=body, headers=kept)
+
+
+class ReplayTC20E:
+    """Local website answering from a cassette.
+
+    Requests are matched on method and path, in the order they were recorded,
+    and answered after their recorded time multiplied by speed.
+    """
+
+    def __init__(self, cassette: Cassette, speed: float = 1.0) -> None:
+        """Initialize the website state."""
+        self.speed = speed
+        self.requests: list[str] = []
+        self.unexpected: list[str] = []
+        self._answers: dict[str, deque[dict[str, Any]]] = {}
+        for interaction in cassette.interactions:
+            self._answers.setdefault(interaction["request"], deque()).append(
+                interaction
+            )
+
+    @property
+    def remaining(self) -> int:
+        """Return number of recorded answers not replayed yet."""
+        return sum(len(answers) for answers in self._answers.values())
+
+    def app(self) -> web.Application:
+        """Return the web application replaying the cassette."""
+
+        app = web.Application()
+        app.router.add_route("*", "/{path:.*}", self._replay)
+        return app
+
+    async def _replay(self, request: web.Request) -> web.Response:
+        key = f"{request.method} {request.path}"
+        self.requests.append(key)
+
+        if not (answers := self._answers.get(key)):
+            self.unexpected.append(key)
+            return web.Response(status=500, text=f"Not in cassette: {key}")
+
+        interaction = answers.popleft()
+        if self.speed:
+            await asyncio.sleep(interaction["elapsed"] * self.speed)
+        return web.Response(
+            status=interaction["status"],
+            text=interaction["body"],
+            headers=interaction["headers"],
+        )
@@ -0,0 +1,267 @@
+"""Fixtures for the Total Connect 2.0E tests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterator, Generator
+from contextlib import asynccontextmanager
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+import pytest
+
+from homeassistant.const import CONF_AUTHENTICATION
+from homeassistant.core import HomeAssistant
+
+from custom_components.tc20e.const import DOMAIN
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+pytest_plugins = "pytest_homeassistant_custom_component"
+
+AUTH_ID = "Basic dXNlcjpwYXNzOjE6MA=="
+SESSION_ID = "0123456789abcdef"
+COMMANDS_PATH = "/applicationservice/domoweb/panel/commands"
+
+
+class FakeTC20E:
+    """Local stand-in for the TC20E website."""
+
+    def __init__(self) -> None:
+        """Initialize the website state."""
+        self.alarmstatus = 100
+        self.message_key = "DISARMED"
+        # Status probes answered with 1 (in progress) before the command is done.
+        self.probes_in_progress = 1
+        # 200 accepts commands to be polled for completion, 201 completes them.
+        self.command_response = 200
+        # Status code the command completes with, 6 when it took too long.
+        self.final_status_code = 2
+        self.reject_commands = False
+        # Seconds each request takes to be answered.
+        self.latency = 0.0
+        self.retry_after: str | None = None
+        self.fail_with: int | None = None
+        self.session_id = SESSION_ID
+        self.padding = 0
+        self.logins = 0
+        self.logouts = 0
+        self.requests: list[str] = []
+        self.concurrent = 0
+        self.max_concurrent = 0
+
+    def app(self) -> web.Application:
+        """Return the web application serving the website."""
+
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/", self._root)
+        app.router.add_get("/validate", self._validate)
+        app.router.add_get("/go/home", self._home)
+        app.router.add_get("/logout", self._logout)
+        app.router.add_put(COMMANDS_PATH + "/status", self._status)
+        app.router.add_put(COMMANDS_PATH + "/{command}", self._command)
+        app.router.add_get(COMMANDS_PATH + "/{command}/{id}/status", self._completion)
+        return app
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler: Any) -> web.Response:
+        self.requests.append(f"{request.method} {request.path}")
+        self.concurrent += 1
+        self.max_concurrent = max(self.max_concurrent, self.concurrent)
+
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            return await self._answer(request, handler)
+        finally:
+            self.concurrent -= 1
+
+    async def _answer(self, request: web.Request, handler: Any) -> web.Response:
+        if self.retry_after is not None:
+            return web.Response(status=429, headers={"Retry-After": self.retry_after})
+
+        if self.fail_with is not None:
+            return web.Response(status=self.fail_with)
+
+        if request.path.startswith(COMMANDS_PATH) and (
+            request.headers.get("x-session-token") != self.session_id
+        ):
+            return web.Response(status=401)
+
+        return await handler(request)
+
+    async def _root(self, request: web.Request) -> web.Response:
+        response = web.Response(text="")
+        response.set_cookie("JSESSIONID", "cookie")
+        return response
+
+    async def _validate(self, request: web.Request) -> web.Response:
+        if request.headers.get("Authorization") != AUTH_ID:
+            return web.Response(text="#0error")
+        return web.Response(text="#1home")
+
+    async def _home(self, request: web.Request) -> web.Response:
+        self.logins += 1
+        return web.Response(
+            text="x" * self.padding + f"var homeSessionId='{self.session_id}';",
+            content_type="text/html",
+        )
+
+    async def _logout(self, request: web.Request) -> web.Response:
+        self.logouts += 1
+        return web.Response(text="")
+
+    async def _status(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "statusCode": 2,
+                "messageKey": self.message_key,
+                "errorCode": self.alarmstatus,
+            },
+            status=201,
+        )
+
+    async def _command(self, request: web.Request) -> web.Response:
+        if self.reject_commands:
+            return web.json_response({"id": 1, "status": "failed"})
+        self._pending = {"arm": 101, "partialarm": 102, "disarm": 100}[
+            request.match_info["command"]
+        ]
+        self._probes = self.probes_in_progress
+
+        if self.command_response == 201:
+            return web.json_response(self._completed(), status=201)
+        return web.json_response({"id": 1, "status": "success"})
+
+    async def _completion(self, request: web.Request) -> web.Response:
+        if self._probes > 0:
+            self._probes -= 1
+            return web.json_response(
+                {"statusCode": 1, "messageKey": None, "errorCode": None}
+            )
+
+        return web.json_response(self._completed())
+
+    def _completed(self) -> dict[str, Any]:
+        if self.final_status_code == 2:
+            self.alarmstatus = self._pending
+        return {
+            "statusCode": self.final_status_code,
+            "messageKey": "DONE",
+            "errorCode": self.alarmstatus,
+        }
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add options to scale the benchmarks and keep their results."""
+
+    group = parser.getgroup("tc20e benchmarks")
+    group.addoption(
+        "--benchmark-json",
+        metavar="PATH",
+        help="write benchmark results as JSON to PATH",
+    )
+    group.addoption(
+        "--benchmark-concurrency",
+        type=int,
+        default=6,
+        help="commands sent at the same time (default: %(default)s)",
+    )
+    group.addoption(
+        "--benchmark-latency",
+        type=float,
+        default=0.01,
+        help="seconds the fake website takes to answer (default: %(default)s)",
+    )
+    group.addoption(
+        "--soak-duration",
+        type=float,
+        default=3,
+        help="seconds the soak test drives the coordinator (default: %(default)s)",
+    )
+    group.addoption(
+        "--soak-concurrency",
+        type=int,
+        default=4,
+        help="operations the soak test runs at once (default: %(default)s)",
+    )
+    group.addoption(
+        "--soak-max-p95",
+        type=float,
+        default=2,
+        help="seconds the p95 latency of any operation may reach "
+        "(default: %(default)s)",
+    )
+    group.addoption(
+        "--soak-max-growth",
+        type=int,
+        default=1_000_000,
+        help="bytes memory may grow during the soak test (default: %(default)s)",
+    )
+    group.addoption(
+        "--record-cassettes",
+        metavar="URL",
+        help="record the replayed cassettes from URL, or from the fake website",
+    )
+
+
+@pytest.fixture(scope="session")
+def benchmark_results(pytestconfig: pytest.Config) -> Generator[dict[str, Any]]:
+    """Collect benchmark results, written out at the end of the session."""
+
+    results: dict[str, Any] = {}
+    yield results
+
+    if results and (path := pytestconfig.getoption("benchmark_json")):
+        Path(path).write_text(json.dumps(results, indent=2) + "\n")
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Enable the integration in all tests."""
+
+
+@asynccontextmanager
+async def async_serve_website(app: web.Application) -> AsyncIterator[str]:
+    """Serve app locally and point the integration at it, yield its URL."""
+
+    server = TestServer(app)
+    await server.start_server()
+    url = str(server.make_url("")).rstrip("/")
+
+    try:
+        with (
+            patch("custom_components.tc20e.api.TC20E_URL", url),
+            patch("custom_components.tc20e.coordinator.TC20E_URL", url),
+        ):
+            yield url
+    finally:
+        await server.close()
+
+
+@pytest.fixture
+async def tc20e(socket_enabled: None) -> AsyncGenerator[FakeTC20E, None]:
+    """Serve a fake TC20E website and point the integration at it."""
+
+    fake = FakeTC20E()
+    async with async_serve_website(fake.app()):
+        yield fake
+
+
+@pytest.fixture
+def config_entry(hass: HomeAssistant) -> MockConfigEntry:
+    """Return a config entry added to Home Assistant."""
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Domonial (user)",
+        unique_id="user",
+        data={CONF_AUTHENTICATION: AUTH_ID},
+        options={"burst_interval": 5},
+    )
+    entry.add_to_hass(hass)
+    return entry
@@ -0,0 +1,182 @@
+"""Load driver timing coordinator operations against the fake TC20E website."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+import itertools
+import time
+from typing import Any
+
+from homeassistant.core import Event, callback
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.tc20e.const import EVENT_TC20E
+from custom_components.tc20e.coordinator import TC20EUpdateCoordinator
+
+from .conftest import FakeTC20E
+
+OPERATIONS = {"full": "arm", "partial": "partial_arm", "disarm": "disarm"}
+
+
+def percentile(values: list[float], percent: float) -> float | None:
+    """Return the percentile of values, as RequestMetrics computes it."""
+
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, round(percent / 100 * (len(values) - 1)))
+    return values[index]
+
+
+class OperationStats:
+    """Latencies and errors of one kind of operation."""
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.latencies: list[float] = []
+        self.errors = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return statistics for the JSON report."""
+
+        def rounded(value: float | None) -> float | None:
+            return None if value is None else round(value, 4)
+
+        return {
+            "count": len(self.latencies),
+            "errors": self.errors,
+            "p50": rounded(percentile(self.latencies, 50)),
+            "p95": rounded(percentile(self.latencies, 95)),
+            "p99": rounded(percentile(self.latencies, 99)),
+            "max": rounded(max(self.latencies, default=None)),
+        }
+
+
+class LoadDriver:
+    """Run polls and commands concurrently on a coordinator and time them.
+
+    Commands are timed until setalarm returns, once the panel accepted them,
+    and until the panel completed them ("<operation>_completed").
+    """
+
+    def __init__(self, coordinator: TC20EUpdateCoordinator, fake: FakeTC20E) -> None:
+        """Initialize the driver."""
+        self.coordinator = coordinator
+        self.fake = fake
+        self.stats: dict[str, OperationStats] = {}
+        self.operations = 0
+        self.elapsed = 0.0
+        self.max_open_connections = 0
+        self._requests = len(fake.requests)
+        self._failed: Counter[str] = Counter()
+        self.unsub = coordinator.hass.bus.async_listen(EVENT_TC20E, self._async_event)
+
+    @callback
+    def _async_event(self, event: Event) -> None:
+        if event.data["type"] == "command_failed":
+            self._failed[event.data["command"]] += 1
+
+    def _record(self, operation: str, start: float, failed: bool = False) -> None:
+        stats = self.stats.setdefault(operation, OperationStats())
+        if failed:
+            stats.errors += 1
+        else:
+            stats.latencies.append(time.monotonic() - start)
+
+    async def async_poll(self) -> None:
+        """Refresh the alarm status."""
+
+        start = time.monotonic()
+        await self.coordinator.async_refresh()
+        self._record("poll", start, not self.coordinator.last_update_success)
+
+    async def async_command(self, command: str) -> None:
+        """Send a command, wait until the panel completed it."""
+
+        operation = OPERATIONS[command]
+        start = time.monotonic()
+
+        try:
+            await self.coordinator.setalarm(command)
+        except HomeAssistantError:
+            self._record(operation, start, failed=True)
+            return
+        self._record(operation, start)
+
+        failed = self._failed[command]
+        if (inflight := self.coordinator._inflight_commands.get(command)) is not None:
+            await asyncio.wait([inflight[0]])
+        self._record(
+            f"{operation}_completed", start, self._failed[command] != failed
+        )
+
+    async def async_run(
+        self,
+        operations: Iterable[Callable[[], Awaitable[None]]],
+        concurrency: int,
+    ) -> None:
+        """Run operations, at most concurrency of them at the same time."""
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(operation: Callable[[], Awaitable[None]]) -> None:
+            async with semaphore:
+                await operation()
+                self.operations += 1
+
+        start = time.monotonic()
+        await asyncio.gather(*(run(operation) for operation in operations))
+        self.elapsed += time.monotonic() - start
+
+    async def async_run_for(
+        self,
+        duration: float,
+        operations: Sequence[Callable[[], Awaitable[None]]],
+        concurrency: int,
+    ) -> None:
+        """Run operations in turn on concurrency workers for duration seconds."""
+
+        start = time.monotonic()
+        deadline = start + duration
+
+        async def worker(first: int) -> None:
+            for operation in itertools.islice(
+                itertools.cycle(operations), first, None
+            ):
+                if time.monotonic() >= deadline:
+                    return
+                await operation()
+                self.operations += 1
+                self.max_open_connections = max(
+                    self.max_open_connections,
+                    self.coordinator.client.pool_stats.open_connections,
+                )
+
+        await asyncio.gather(*(worker(first) for first in range(concurrency)))
+        self.elapsed += time.monotonic() - start
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the report of everything run so far."""
+
+        queue = self.coordinator.queue
+        requests = len(self.fake.requests) - self._requests
+        return {
+            "operations": {name: stats.as_dict() for name, stats in self.stats.items()},
+            "elapsed": round(self.elapsed, 3),
+            "throughput": round(self.operations / self.elapsed, 2)
+            if self.elapsed
+            else None,
+            "requests": requests,
+            "requests_per_operation": round(requests / self.operations, 2)
+            if self.operations
+            else None,
+            "max_concurrent_requests": self.fake.max_concurrent,
+            "max_open_connections": self.max_open_connections,
+            "queue": {
+                "max_wait": round(queue.max_wait, 4),
+                "coalesced": queue.coalesced,
+                "deduplicated": self.coordinator.cache_stats["deduplicated"],
+            },
+        }
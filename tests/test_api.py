@@ -0,0 +1,213 @@
+"""Tests for the TC20E client."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+import re
+import time
+import tracemalloc
+from typing import Any
+from unittest.mock import MagicMock
+
+import aiohttp
+import pytest
+
+from custom_components.tc20e.api import (
+    CHUNK_SIZE,
+    AuthenticationError,
+    TC20EClient,
+    async_create_tc20e_connector,
+    async_extract_session_id,
+)
+from custom_components.tc20e.rate_limiter import RateLimiter
+
+from .conftest import AUTH_ID, SESSION_ID, FakeTC20E
+
+HOME_PAGE = b"<html><script>var homeSessionId='" + SESSION_ID.encode() + b"';</script>"
+# A home page of a few hundred kilobytes, the session id near its end.
+LARGE_HOME_PAGE = (
+    b"<html><head><title>Total Connect 2.0E</title></head><body>"
+    + b"".join(
+        b'<div class="zone" id="zone%d"><span class="label">Zone %d</span>'
+        b'<img src="/img/zone.png" alt=""/><a href="#">Bypass</a></div>\n' % (i, i)
+        for i in range(2000)
+    )
+    + b"<script>var homeSessionId='"
+    + SESSION_ID.encode()
+    + b"';</script></body></html>"
+)
+BENCHMARK_ROUNDS = 2
+
+
+def _response(*chunks: bytes) -> MagicMock:
+    """Return a response streaming the given chunks."""
+
+    read: list[bytes] = []
+
+    async def iter_chunked(size: int) -> AsyncIterator[bytes]:
+        for chunk in chunks:
+            read.append(chunk)
+            yield chunk
+
+    response = MagicMock()
+    response.content.iter_chunked = iter_chunked
+    response.read_chunks = read
+    return response
+
+
+@pytest.mark.parametrize("split", range(1, len(HOME_PAGE)))
+async def test_extract_session_id_split(split: int) -> None:
+    """The session id is found wherever the chunks are split."""
+
+    response = _response(HOME_PAGE[:split], HOME_PAGE[split:])
+
+    assert await async_extract_session_id(response) == SESSION_ID
+    response.release.assert_called_once()
+
+
+async def test_extract_session_id_byte_chunks() -> None:
+    """The session id is found when every chunk is a single byte."""
+
+    response = _response(*(HOME_PAGE[i : i + 1] for i in range(len(HOME_PAGE))))
+
+    assert await async_extract_session_id(response) == SESSION_ID
+
+
+async def test_extract_session_id_stops_reading() -> None:
+    """The rest of the page is not read once the session id is found."""
+
+    response = _response(b"x" * CHUNK_SIZE, HOME_PAGE, b"y" * CHUNK_SIZE)
+
+    assert await async_extract_session_id(response) == SESSION_ID
+    assert len(response.read_chunks) == 2
+
+
+async def test_extract_session_id_missing() -> None:
+    """A page without the session id returns None and is released."""
+
+    response = _response(b"homeSession", b"Id=" + b"x" * CHUNK_SIZE, b"</html>")
+
+    assert await async_extract_session_id(response) is None
+    response.release.assert_called_once()
+
+
+async def _measure(extract: Any) -> dict[str, float]:
+    """Return CPU seconds per round and peak memory of extracting the session id."""
+
+    chunks = [
+        LARGE_HOME_PAGE[i : i + CHUNK_SIZE]
+        for i in range(0, len(LARGE_HOME_PAGE), CHUNK_SIZE)
+    ]
+
+    start = time.process_time()
+    for _ in range(BENCHMARK_ROUNDS):
+        assert await extract(_response(*chunks)) == SESSION_ID
+    cpu = (time.process_time() - start) / BENCHMARK_ROUNDS
+
+    response = _response(*chunks)
+    tracemalloc.start()
+    try:
+        await extract(response)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"cpu_seconds": round(cpu, 6), "peak_bytes": peak}
+
+
+async def test_benchmark_extract_session_id(benchmark_results: dict[str, Any]) -> None:
+    """Streaming the page costs less CPU and memory than parsing it with bs4."""
+
+    bs4 = pytest.importorskip("bs4")
+
+    async def extract_with_bs4(response: MagicMock) -> str:
+        # How the session id was found before streaming the page.
+        text = b"".join([chunk async for chunk in response.content.iter_chunked(0)])
+        soup = bs4.BeautifulSoup(text.decode(), "html.parser")
+        return re.search(r"homeSessionId='(.*?)'", soup.prettify()).group(1)
+
+    streaming = await _measure(async_extract_session_id)
+    parsing = await _measure(extract_with_bs4)
+    benchmark_results["extract_session_id"] = {
+        "page_bytes": len(LARGE_HOME_PAGE),
+        "streaming": streaming,
+        "bs4_prettify": parsing,
+    }
+
+    assert streaming["cpu_seconds"] < parsing["cpu_seconds"] / 10
+    assert streaming["peak_bytes"] < parsing["peak_bytes"] / 10
+
+
+@pytest.fixture
+async def connector() -> AsyncIterator[aiohttp.TCPConnector]:
+    """Return a connection pool closed after the test."""
+    connector = async_create_tc20e_connector()
+    yield connector
+    await connector.close()
+
+
+def _client(connector: aiohttp.TCPConnector, auth_id: str = AUTH_ID) -> TC20EClient:
+    return TC20EClient(auth_id, connector, RateLimiter(60, 10))
+
+
+async def test_login_reuses_session(
+    tc20e: FakeTC20E, connector: aiohttp.TCPConnector
+) -> None:
+    """Login once, then reuse the session until it is idle too long."""
+
+    tc20e.padding = CHUNK_SIZE - 10
+    client = _client(connector)
+
+    await client.async_ensure_session()
+    await client.async_ensure_session()
+    assert client.session_id == SESSION_ID
+    assert tc20e.logins == 1
+
+    client.session_ttl = 0
+    await client.async_ensure_session()
+    assert tc20e.logins == 2
+
+    await client.async_logout()
+    assert client.session_id is None
+    assert tc20e.logouts == 1
+
+    await client.async_close(logout=False)
+
+
+async def test_login_invalid_auth(
+    tc20e: FakeTC20E, connector: aiohttp.TCPConnector
+) -> None:
+    """Invalid credentials raise an authentication error."""
+
+    client = _client(connector, "Basic invalid")
+
+    with pytest.raises(AuthenticationError):
+        await client.async_ensure_session()
+    assert client.session_id is None
+
+    await client.async_close(logout=False)
+
+
+async def test_session_export_import(
+    tc20e: FakeTC20E, connector: aiohttp.TCPConnector
+) -> None:
+    """A stored session is resumed unless it was idle for too long."""
+
+    client = _client(connector)
+    await client.async_ensure_session()
+    data = client.export_session()
+    await client.async_close(logout=False)
+
+    assert data["session_id"] == SESSION_ID
+
+    client = _client(connector)
+    assert client.import_session(data)
+    assert client.session_id == SESSION_ID
+    await client.async_ensure_session()
+    assert tc20e.logins == 1
+    await client.async_close(logout=False)
+
+    client = _client(connector)
+    assert not client.import_session(data | {"last_used": time.time() - 3600})
+    assert client.session_id is None
+    await client.async_close(logout=False)
@@ -0,0 +1,113 @@
+"""Latency benchmarks of the coordinator against the fake TC20E website.
+
+Run with a larger load and keep the results for comparison:
+
+    pytest tests/test_benchmark.py --benchmark-concurrency 50 \
+        --benchmark-latency 0.1 --benchmark-json benchmark.json
+"""
+
+from __future__ import annotations
+
+import itertools
+from typing import Any
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.tc20e.scheduler import MAX_CONCURRENT_REQUESTS
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from . import async_setup_integration
+from .conftest import COMMANDS_PATH, FakeTC20E
+from .load import OPERATIONS, LoadDriver
+
+ROUNDS = 3
+
+
+@pytest.fixture
+async def driver(
+    hass: HomeAssistant,
+    pytestconfig: pytest.Config,
+    tc20e: FakeTC20E,
+    config_entry: MockConfigEntry,
+) -> LoadDriver:
+    """Return a load driver of a set up coordinator, latency applied."""
+
+    # Send every command, none is skipped for a recently confirmed state or
+    # held back by the rate limit.
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options=config_entry.options
+        | {"state_max_age": 0, "rate_limit": 6000, "rate_burst": 100},
+    )
+    coordinator = await async_setup_integration(hass, config_entry)
+    tc20e.latency = pytestconfig.getoption("benchmark_latency")
+
+    driver = LoadDriver(coordinator, tc20e)
+    yield driver
+    driver.unsub()
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_benchmark_poll_and_commands(
+    driver: LoadDriver, tc20e: FakeTC20E, benchmark_results: dict[str, Any]
+) -> None:
+    """Time polls and commands one at a time, count requests of each."""
+
+    requests: dict[str, int] = {}
+
+    for operation in [driver.async_poll] * ROUNDS:
+        sent = len(tc20e.requests)
+        await driver.async_run([operation], concurrency=1)
+        requests["poll"] = len(tc20e.requests) - sent
+
+    for command in itertools.chain.from_iterable([OPERATIONS] * ROUNDS):
+        sent = len(tc20e.requests)
+        await driver.async_run(
+            [lambda command=command: driver.async_command(command)], concurrency=1
+        )
+        requests[OPERATIONS[command]] = len(tc20e.requests) - sent
+
+    report = driver.as_dict()
+    benchmark_results["sequential"] = report | {"requests_by_operation": requests}
+
+    # A status poll, a command and its completion probes.
+    assert requests == {
+        "poll": 1,
+        "arm": tc20e.probes_in_progress + 2,
+        "partial_arm": tc20e.probes_in_progress + 2,
+        "disarm": tc20e.probes_in_progress + 2,
+    }
+    assert all(stats["errors"] == 0 for stats in report["operations"].values())
+
+
+async def test_benchmark_concurrent_commands(
+    driver: LoadDriver,
+    pytestconfig: pytest.Config,
+    tc20e: FakeTC20E,
+    benchmark_results: dict[str, Any],
+) -> None:
+    """Time commands and polls sent at the same time, report their queueing."""
+
+    concurrency = pytestconfig.getoption("benchmark_concurrency")
+    commands = itertools.islice(itertools.cycle(OPERATIONS), concurrency)
+    operations = [
+        driver.async_poll,
+        *(lambda command=command: driver.async_command(command) for command in commands),
+        driver.async_poll,
+    ]
+
+    await driver.async_run(operations, concurrency=len(operations))
+
+    report = driver.as_dict()
+    benchmark_results["concurrent"] = report | {"concurrency": concurrency}
+
+    assert all(stats["errors"] == 0 for stats in report["operations"].values())
+    assert report["max_concurrent_requests"] <= MAX_CONCURRENT_REQUESTS
+    # Commands already in flight and polls already queued are joined.
+    assert tc20e.requests.count(f"PUT {COMMANDS_PATH}/arm") == 1
+    assert report["queue"]["deduplicated"] == max(0, concurrency - len(OPERATIONS))
+    assert report["queue"]["coalesced"] == 1
@@ -0,0 +1,101 @@
+"""Tests for the TC20E circuit breaker."""
+
+from __future__ import annotations
+
+from collections.abc import Generator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from custom_components.tc20e.circuit_breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+)
+
+
+@pytest.fixture
+def clock() -> Generator[MagicMock, None, None]:
+    """Control the clock of the breaker."""
+    with patch("custom_components.tc20e.circuit_breaker.time") as mock_time:
+        mock_time.monotonic.return_value = 1000.0
+        yield mock_time.monotonic
+
+
+def test_opens_at_threshold(clock: MagicMock) -> None:
+    """The breaker opens after threshold consecutive failures."""
+
+    breaker = CircuitBreaker(3, 60, 900)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert breaker.time_to_retry == 60
+    assert not breaker.allow()
+
+
+def test_success_resets_failures(clock: MagicMock) -> None:
+    """Failures only count when consecutive."""
+
+    breaker = CircuitBreaker(3, 60, 900)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+
+    assert breaker.state == STATE_CLOSED
+
+
+def test_half_open_probe(clock: MagicMock) -> None:
+    """After the reset timeout one probe is let through."""
+
+    breaker = CircuitBreaker(1, 60, 900)
+    breaker.record_failure()
+
+    clock.return_value += 60
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.allow()
+
+
+def test_failed_probe_backs_off(clock: MagicMock) -> None:
+    """A failed probe reopens the breaker with a doubled, capped timeout."""
+
+    breaker = CircuitBreaker(1, 60, 200)
+    breaker.record_failure()
+
+    for timeout in (120, 200, 200):
+        clock.return_value += breaker.time_to_retry
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == STATE_OPEN
+        assert breaker.time_to_retry == timeout
+
+    clock.return_value += 200
+    assert breaker.allow()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.time_to_retry == 60
+
+
+def test_release_lets_next_probe_through(clock: MagicMock) -> None:
+    """A probe that ended without result does not block the breaker."""
+
+    breaker = CircuitBreaker(1, 60, 900)
+    breaker.record_failure()
+    clock.return_value += 60
+
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
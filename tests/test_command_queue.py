@@ -0,0 +1,143 @@
+"""Tests for the TC20E request queue."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.tc20e.command_queue import (
+    PRIORITY_COMMAND,
+    PRIORITY_STATUS,
+    CommandQueue,
+)
+
+
+async def test_commands_run_before_status_polls() -> None:
+    """Queued commands get the slot before queued polls, in arrival order."""
+
+    queue = CommandQueue()
+    release = asyncio.Event()
+    order: list[str] = []
+
+    def job(name: str):
+        async def run() -> str:
+            order.append(name)
+            return name
+
+        return run
+
+    holder = asyncio.create_task(queue.async_run(PRIORITY_COMMAND, release.wait))
+    await asyncio.sleep(0)
+
+    tasks = [
+        asyncio.create_task(queue.async_run(PRIORITY_STATUS, job("poll"))),
+        asyncio.create_task(queue.async_run(PRIORITY_COMMAND, job("arm"))),
+        asyncio.create_task(queue.async_run(PRIORITY_COMMAND, job("disarm"))),
+    ]
+    await asyncio.sleep(0)
+    assert queue.busy
+    assert queue.depth == 3
+
+    release.set()
+    await asyncio.gather(holder, *tasks)
+
+    assert order == ["arm", "disarm", "poll"]
+    assert not queue.busy
+    assert queue.depth == 0
+
+
+async def test_coalesced_requests_share_one_call() -> None:
+    """Requests with the same key join the one already in flight."""
+
+    queue = CommandQueue()
+    release = asyncio.Event()
+    calls = 0
+
+    async def poll() -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return calls
+
+    tasks = [
+        asyncio.create_task(queue.async_run(PRIORITY_STATUS, poll, "status"))
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*tasks) == [1, 1, 1]
+    assert calls == 1
+    assert queue.coalesced == 2
+
+
+async def test_cancel_queued_request() -> None:
+    """A cancelled request leaves the queue, the next one still runs."""
+
+    queue = CommandQueue()
+    release = asyncio.Event()
+
+    async def job() -> str:
+        return "done"
+
+    holder = asyncio.create_task(queue.async_run(PRIORITY_COMMAND, release.wait))
+    await asyncio.sleep(0)
+    cancelled = asyncio.create_task(queue.async_run(PRIORITY_COMMAND, job))
+    waiting = asyncio.create_task(queue.async_run(PRIORITY_STATUS, job))
+    await asyncio.sleep(0)
+
+    cancelled.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    assert queue.depth == 1
+
+    release.set()
+    assert await waiting == "done"
+    await holder
+    assert not queue.busy
+
+
+async def test_cancel_after_release_popped_the_request() -> None:
+    """A request cancelled just before the slot is released is dropped."""
+
+    queue = CommandQueue()
+
+    async def job() -> str:
+        return "done"
+
+    await queue._acquire(PRIORITY_COMMAND)
+    task = asyncio.create_task(queue.async_run(PRIORITY_COMMAND, job))
+    await asyncio.sleep(0)
+
+    # Cancelled, and popped by the release before the task got to run.
+    task.cancel()
+    queue._release()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert not queue.busy
+    assert queue.depth == 0
+    assert await queue.async_run(PRIORITY_COMMAND, job) == "done"
+
+
+async def test_cancel_after_slot_handed_over() -> None:
+    """A request cancelled after it was handed the slot passes it on."""
+
+    queue = CommandQueue()
+
+    async def job() -> str:
+        return "done"
+
+    await queue._acquire(PRIORITY_COMMAND)
+    cancelled = asyncio.create_task(queue.async_run(PRIORITY_COMMAND, job))
+    waiting = asyncio.create_task(queue.async_run(PRIORITY_STATUS, job))
+    await asyncio.sleep(0)
+
+    queue._release()
+    cancelled.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    assert await waiting == "done"
+    assert not queue.busy
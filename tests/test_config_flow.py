@@ -0,0 +1,114 @@
+"""Tests for the Total Connect 2.0E config flow."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from homeassistant import config_entries
+from homeassistant.const import (
+    CONF_AUTHENTICATION,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    EVENT_HOMEASSISTANT_CLOSE,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.tc20e.const import DATA_CLIENTS, DATA_SCHEDULER, DOMAIN
+from custom_components.tc20e.scheduler import async_release_scheduler
+
+from .conftest import AUTH_ID, FakeTC20E
+
+
+async def test_user_flow_hands_session_over(
+    hass: HomeAssistant, tc20e: FakeTC20E
+) -> None:
+    """The coordinator reuses the session the config flow logged in with."""
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    assert result["type"] == FlowResultType.FORM
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_USERNAME: "user", CONF_PASSWORD: "pass"}
+    )
+    await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"] == {CONF_AUTHENTICATION: AUTH_ID}
+
+    entry = result["result"]
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert tc20e.logins == 1
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_user_flow_auth_error(hass: HomeAssistant, tc20e: FakeTC20E) -> None:
+    """A failed login shows an error and does not keep a connection pool."""
+
+    listeners = hass.bus.async_listeners().get(EVENT_HOMEASSISTANT_CLOSE, 0)
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_USERNAME: "user", CONF_PASSWORD: "wrong"}
+    )
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"base": "auth_error"}
+    assert DATA_SCHEDULER not in hass.data
+    assert hass.bus.async_listeners().get(EVENT_HOMEASSISTANT_CLOSE, 0) == listeners
+
+
+async def test_user_flow_cannot_connect(hass: HomeAssistant, tc20e: FakeTC20E) -> None:
+    """A website that does not answer shows a connection error."""
+
+    tc20e.retry_after = "60"
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_USERNAME: "user", CONF_PASSWORD: "pass"}
+    )
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"base": "connection_error"}
+    assert DATA_SCHEDULER not in hass.data
+
+
+async def test_failed_flow_keeps_handed_over_client(
+    hass: HomeAssistant, tc20e: FakeTC20E
+) -> None:
+    """A failed login keeps the pool of a client waiting for its entry."""
+
+    with patch("custom_components.tc20e.async_setup_entry", return_value=True):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": config_entries.SOURCE_USER}
+        )
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_USERNAME: "user", CONF_PASSWORD: "pass"}
+        )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    client = hass.data[DATA_CLIENTS][AUTH_ID]
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_USERNAME: "other", CONF_PASSWORD: "wrong"}
+    )
+
+    assert result["errors"] == {"base": "auth_error"}
+    assert DATA_SCHEDULER in hass.data
+    assert not client.websession.connector.closed
+
+    await hass.data.pop(DATA_CLIENTS).pop(AUTH_ID).async_close(logout=False)
+    await async_release_scheduler(hass)
+    assert DATA_SCHEDULER not in hass.data
@@ -0,0 +1,394 @@
+"""Tests for the TC20E coordinator."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from typing import Any
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from homeassistant.const import (
+    STATE_ALARM_ARMED_AWAY,
+    STATE_ALARM_ARMING,
+    STATE_ALARM_DISARMED,
+    STATE_UNAVAILABLE,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from custom_components.tc20e.circuit_breaker import STATE_CLOSED
+from custom_components.tc20e.const import EVENT_TC20E, STORAGE_KEY
+from custom_components.tc20e.api import CannotConnectError
+from custom_components.tc20e.command_queue import PRIORITY_STATUS
+from custom_components.tc20e.coordinator import TC20EUpdateCoordinator
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+    async_fire_time_changed,
+)
+
+from . import async_setup_integration
+from .conftest import COMMANDS_PATH, SESSION_ID, FakeTC20E
+
+ENTITY_ID = "alarm_control_panel.domonial_alarm_panel"
+
+
+async def _wait_for_commands(coordinator: TC20EUpdateCoordinator) -> None:
+    """Wait until commands tracked in the background are completed."""
+    await asyncio.gather(
+        *(task for task, _ in coordinator._inflight_commands.values()),
+        return_exceptions=True,
+    )
+
+
+async def test_setalarm_returns_when_accepted(
+    hass: HomeAssistant, tc20e: FakeTC20E, config_entry: MockConfigEntry
+) -> None:
+    """Arming returns once accepted, completion is tracked in the background."""
+
+    coordinator = await async_setup_integration(hass, config_entry)
+    events = async_capture_events(hass, EVENT_TC20E)
+    tc20e.probes_in_progress = 2
+
+    await hass.services.async_call(
+        "alarm_control_panel", "alarm_arm_away", {"entity_id": ENTITY_ID}, True
+    )
+
+    assert coordinator.pending_command == "full"
+    assert coordinator.inflight_commands == ["full"]
+    assert hass.states.get(ENTITY_ID).state == STATE_ALARM_ARMING
+
+    await _wait_for_commands(coordinator)
+    await hass.async_block_till_done()
+
+    assert coordinator.pending_command is None
+    assert coordinator.alarmstatus == 101
+    assert coordinator.completion_stats["arm"]["probes"] == 3
+    assert hass.states.get(ENTITY_ID).state == STATE_ALARM_ARMED_AWAY
+    assert [event.data["type"] for event in events] == ["command"]
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_setalarm_completed_on_send(
+    hass: HomeAssistant, tc20e: FakeTC20E, config_entry: MockConfigEntry
+) -> None:
+    """A command answered with its status needs no completion polling."""
+
+    coordinator = await async_setup_integration(hass, config_entry)
+    tc20e.command_response = 201
+
+    await coordinator.setalarm("full")
+
+    assert tc20e.requests[-1] == f"PUT {COMMANDS_PATH}/arm"
+    assert coordinator.alarmstatus == 101
+    assert coordinator.pending_command is None
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_setalarm_too_long(
+    hass: HomeAssistant, tc20e: FakeTC20E, config_entry: MockConfigEntry
+) -> None:
+    """A command the website answers as taking too long fails."""
+
+    coordinator = await async_setup_integration(hass, config_entry)
+    tc20e.command_response = 201
+    tc20e.final_status_code = 6
+
+    with pytest.raises(HomeAssistantError):
+        await coordinator.setalarm("full")
+
+    assert coordinator.alarmstatus == 100
+    assert coordinator.pending_command is None
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_setalarm_joins_command_in_flight(
+    hass: HomeAssistant, tc20e: FakeTC20E, config_entry: MockConfigEntry
+) -> None:
+    """The same command sent twice is only sent to the website once."""
+
+    coordinator = await async_setup_integration(hass, config_entry)
+
+    await asyncio.gather(coordinator.setalarm("full"), coordinator.setalarm("full"))
+    await _wait_for_commands(coordinator)
+
+    assert tc20e.requests.count(f"PUT {COMMANDS_PATH}/arm") == 1
+    assert coordinator.cache_stats["deduplicated"] == 1
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_setalarm_skips_confirmed_state(
+    hass: HomeAssistant, tc20e: FakeTC20E, config_entry: MockConfigEntry
+) -> None:
+    """A command for the state the panel was just confirmed in is skipped."""
+
+    coordinator = await async_setup_integration(hass, config_entry)
+    requests = len(tc20e.requests)
+
+    await coordinator.setalarm("disarm")
+
+    assert len(tc20e.requests) == requests
+    assert coordinator.cache_stats["hits"] == 1
+    assert coordinator.pending_command is None
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_setalarm_rolls_back(
+    hass: HomeAssistant, tc20e: FakeTC20E, config_entry: MockConfigEntry
+) -> None:
+    """A rejected command raises and leaves the alarm status as it was."""
+
+    coordinator = await async_setup_integration(hass, config_entry)
+    tc20e.reject_commands = True
+
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            "alarm_control_panel", "alarm_arm_away", {"entity_id": ENTITY_ID}, True
+        )
+
+    assert coordinator.alarmstatus == 100
+    assert coordinator.pending_command is None
+    assert coordinator.inflight_commands == []
+    assert hass.states.get(ENTITY_ID).state == STATE_ALARM_DISARMED
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_session_expired_logs_in_again(
+    hass: HomeAssistant, tc20e: FakeTC20E, config_entry: MockConfigEntry
+) -> None:
+    """A session rejected by the website is replaced by a new login."""
+
+    coordinator = await async_setup_integration(hass, config_entry)
+    tc20e.session_id = "new"
+
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.client.session_id == "new"
+    assert tc20e.logins == 2
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_close_keeps_session_of_cancelled_command(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    tc20e: FakeTC20E,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Unloading with a command in flight stores the session, still logged in."""
+
+    coordinator = await async_setup_integration(hass, config_entry)
+    tc20e.probes_in_progress = 100
+
+    await coordinator.setalarm("full")
+    assert coordinator.inflight_commands == ["full"]
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert coordinator.inflight_commands == []
+    assert tc20e.logouts == 0
+    stored = hass_storage[f"{STORAGE_KEY}.{config_entry.entry_id}"]["data"]
+    assert stored["session_id"] == SESSION_ID
+
+
+async def test_close_fails_command_not_yet_accepted(
+    hass: HomeAssistant, tc20e: FakeTC20E, config_entry: MockConfigEntry
+) -> None:
+    """A caller waiting on a command cancelled by unloading gets an error."""
+
+    coordinator = await async_setup_integration(hass, config_entry)
+    semaphore = coordinator.scheduler.semaphore
+    # Hold every request slot so the command is still waiting when unloading.
+    while not semaphore.locked():
+        await semaphore.acquire()
+
+    setalarm = hass.async_create_task(coordinator.setalarm("full"))
+    await asyncio.sleep(0)
+    assert coordinator.inflight_commands == ["full"]
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+    with pytest.raises(HomeAssistantError, match="integration unloading"):
+        await setalarm
+    assert coordinator.inflight_commands == []
+
+
+async def test_status_events_resume_from_stored_cursor(
+    hass: HomeAssistant, tc20e: FakeTC20E, config_entry: MockConfigEntry
+) -> None:
+    """After a reload only status changes since the last one fire events."""
+
+    events = async_capture_events(hass, EVENT_TC20E)
+
+    await async_setup_integration(hass, config_entry)
+    assert [(event.data["type"], event.data["previous"]) for event in events] == [
+        ("status", 0)
+    ]
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+    events.clear()
+    coordinator = await async_setup_integration(hass, config_entry)
+    assert events == []
+
+    tc20e.alarmstatus = 102
+    await coordinator.async_refresh()
+    assert [event.data for event in events] == [
+        {
+            "entry_id": config_entry.entry_id,
+            "type": "status",
+            "time": events[0].data["time"],
+            "previous": 100,
+            "alarmstatus": 102,
+            "message": "DISARMED",
+        }
+    ]
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_retry_after_does_not_open_circuit(
+    hass: HomeAssistant, tc20e: FakeTC20E, config_entry: MockConfigEntry
+) -> None:
+    """Requests held back by Retry-After fail fast and keep the circuit closed."""
+
+    coordinator = await async_setup_integration(hass, config_entry)
+    tc20e.retry_after = "120"
+
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    requests = len(tc20e.requests)
+
+    tc20e.retry_after = None
+    for _ in range(4):
+        await coordinator.async_refresh()
+
+    assert not coordinator.last_update_success
+    assert len(tc20e.requests) == requests
+    assert coordinator.breaker.state == STATE_CLOSED
+    assert coordinator.scheduler.limiter.as_dict()["deferred"] == 4
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_circuit_opens_when_unreachable(
+    hass: HomeAssistant, tc20e: FakeTC20E, config_entry: MockConfigEntry
+) -> None:
+    """Connection failures open the circuit, later refreshes are not sent."""
+
+    coordinator = await async_setup_integration(hass, config_entry)
+    coordinator.client.invalidate()
+
+    # Nothing listens on port 1.
+    with (
+        patch("custom_components.tc20e.api.TC20E_URL", "http://127.0.0.1:1"),
+        patch("custom_components.tc20e.coordinator.TC20E_URL", "http://127.0.0.1:1"),
+    ):
+        for _ in range(4):
+            await coordinator.async_refresh()
+
+    assert coordinator.breaker.state == "open"
+    assert coordinator.metrics.as_dict()["poll"]["errors"] == 3
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_coalesced_poll_failure_counts_once(
+    hass: HomeAssistant, tc20e: FakeTC20E, config_entry: MockConfigEntry
+) -> None:
+    """Callers sharing a failed status poll count as one connection failure."""
+
+    coordinator = await async_setup_integration(hass, config_entry)
+    coordinator.client.invalidate()
+
+    with (
+        patch("custom_components.tc20e.api.TC20E_URL", "http://127.0.0.1:1"),
+        patch("custom_components.tc20e.coordinator.TC20E_URL", "http://127.0.0.1:1"),
+    ):
+        results = await asyncio.gather(
+            *(coordinator._request(COMMANDS_PATH, PRIORITY_STATUS) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    assert all(isinstance(result, CannotConnectError) for result in results)
+    assert coordinator.breaker._failures == 1
+    assert coordinator.breaker.state == STATE_CLOSED
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_slow_completion_keeps_circuit_closed(
+    hass: HomeAssistant, tc20e: FakeTC20E, config_entry: MockConfigEntry
+) -> None:
+    """A panel missing the completion deadline does not open the circuit."""
+
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options=config_entry.options | {"completion_deadline": 1, "state_max_age": 0},
+    )
+    coordinator = await async_setup_integration(hass, config_entry)
+    tc20e.probes_in_progress = 100
+
+    for command in ("full", "partial", "full"):
+        await coordinator.setalarm(command)
+        await _wait_for_commands(coordinator)
+
+    assert coordinator.breaker.state == STATE_CLOSED
+    assert coordinator.alarmstatus == 100
+
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_unavailable_once_stale(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    tc20e: FakeTC20E,
+    config_entry: MockConfigEntry,
+) -> None:
+    """The panel keeps its last state while refreshes fail, until it is stale."""
+
+    hass.config_entries.async_update_entry(
+        config_entry, options=config_entry.options | {"stale_after": 3600}
+    )
+    coordinator = await async_setup_integration(hass, config_entry)
+    confirmed = dt_util.utcnow()
+    tc20e.fail_with = 500
+
+    # Only the first failed refresh notifies the entity.
+    for _ in range(3):
+        freezer.tick(coordinator.update_interval)
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+        assert not coordinator.last_update_success
+        assert hass.states.get(ENTITY_ID).state == STATE_ALARM_DISARMED
+
+    freezer.move_to(confirmed + timedelta(seconds=3600))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get(ENTITY_ID).state == STATE_ALARM_DISARMED
+
+    freezer.tick(2)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get(ENTITY_ID).state == STATE_UNAVAILABLE
+
+    tc20e.fail_with = None
+    await coordinator.async_refresh()
+    assert hass.states.get(ENTITY_ID).state == STATE_ALARM_DISARMED
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
@@ -0,0 +1,203 @@
+"""Tests for setup and unload of the Total Connect 2.0E integration."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import subprocess
+import sys
+from typing import Any
+
+from homeassistant.const import CONF_AUTHENTICATION, EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+from custom_components.tc20e.api import TC20EClient
+from custom_components.tc20e.const import DATA_CLIENTS, DATA_SCHEDULER, DOMAIN
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from . import async_setup_integration
+from .conftest import AUTH_ID, FakeTC20E
+
+
+# Modules Home Assistant has loaded before it imports the integration.
+PRELOADED = (
+    "aiohttp",
+    "voluptuous",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.event",
+    "homeassistant.helpers.storage",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.components.alarm_control_panel",
+    "homeassistant.components.sensor",
+)
+INTEGRATION = (
+    "custom_components.tc20e",
+    "custom_components.tc20e.config_flow",
+    "custom_components.tc20e.alarm_control_panel",
+    "custom_components.tc20e.sensor",
+)
+IMPORT_BUDGET = 0.1
+
+
+def _close_listeners(hass: HomeAssistant) -> int:
+    return hass.bus.async_listeners().get(EVENT_HOMEASSISTANT_CLOSE, 0)
+
+
+async def test_accounts_share_scheduler(
+    hass: HomeAssistant, tc20e: FakeTC20E, config_entry: MockConfigEntry
+) -> None:
+    """Accounts share pool and rate limit, each has its own entities."""
+
+    listeners = _close_listeners(hass)
+    first = await async_setup_integration(hass, config_entry)
+
+    second_entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="other",
+        data={CONF_AUTHENTICATION: AUTH_ID},
+        options={"rate_limit": 12, "rate_burst": 20},
+    )
+    second_entry.add_to_hass(hass)
+    second = await async_setup_integration(
+        hass, second_entry, wait_first_refresh=False
+    )
+
+    assert first.scheduler is second.scheduler
+    assert first.client.websession.connector is second.client.websession.connector
+    assert (first.refresh_offset, second.refresh_offset) == (0, 20)
+    limiter = first.scheduler.limiter.as_dict()
+    assert (limiter["rate_per_minute"], limiter["burst"]) == (12, 10)
+    assert _close_listeners(hass) == listeners + 1
+
+    entity_registry = er.async_get(hass)
+    unique_ids = {
+        entity.unique_id
+        for entity in entity_registry.entities.values()
+        if entity.platform == DOMAIN
+    }
+    assert len(unique_ids) == 8
+    assert config_entry.entry_id in unique_ids
+    assert second_entry.entry_id in unique_ids
+
+    assert await hass.config_entries.async_unload(second_entry.entry_id)
+    limiter = first.scheduler.limiter.as_dict()
+    assert (limiter["rate_per_minute"], limiter["burst"]) == (30, 10)
+
+    connector = first.client.websession.connector
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    assert DATA_SCHEDULER not in hass.data
+    assert connector.closed
+    assert _close_listeners(hass) == listeners
+
+
+async def test_unload_closes_clients_never_set_up(
+    hass: HomeAssistant, tc20e: FakeTC20E, config_entry: MockConfigEntry
+) -> None:
+    """Clients handed over for an entry that never set up are logged out."""
+
+    coordinator = await async_setup_integration(hass, config_entry)
+    scheduler = coordinator.scheduler
+    client = TC20EClient(AUTH_ID, scheduler.connector, scheduler.limiter)
+    await client.async_ensure_session()
+    hass.data[DATA_CLIENTS] = {"other": client}
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+    assert DATA_CLIENTS not in hass.data
+    assert client.websession.closed
+    assert tc20e.logouts == 1
+
+
+async def test_reload_does_not_leak_listeners(
+    hass: HomeAssistant, tc20e: FakeTC20E, config_entry: MockConfigEntry
+) -> None:
+    """Reloading an entry replaces the scheduler and its close listener."""
+
+    listeners = _close_listeners(hass)
+    await async_setup_integration(hass, config_entry)
+
+    for _ in range(3):
+        assert await hass.config_entries.async_unload(config_entry.entry_id)
+        await async_setup_integration(hass, config_entry)
+
+    assert _close_listeners(hass) == listeners + 1
+    assert tc20e.logins == 1
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_migrate_legacy_unique_ids(
+    hass: HomeAssistant, tc20e: FakeTC20E, config_entry: MockConfigEntry
+) -> None:
+    """Entities and device of the single panel setup move to per entry ids."""
+
+    entity_registry = er.async_get(hass)
+    device_registry = dr.async_get(hass)
+    device = device_registry.async_get_or_create(
+        config_entry_id=config_entry.entry_id,
+        identifiers={(DOMAIN, "domonial_alarm_panel_1")},
+    )
+    panel = entity_registry.async_get_or_create(
+        "alarm_control_panel",
+        DOMAIN,
+        "domonial_alarm_panel_1",
+        config_entry=config_entry,
+        device_id=device.id,
+    )
+    sensor = entity_registry.async_get_or_create(
+        "sensor",
+        DOMAIN,
+        "domonial_alarm_panel_1_last_poll_latency",
+        config_entry=config_entry,
+        device_id=device.id,
+    )
+
+    await async_setup_integration(hass, config_entry)
+
+    assert entity_registry.async_get(panel.entity_id).unique_id == (
+        config_entry.entry_id
+    )
+    assert entity_registry.async_get(sensor.entity_id).unique_id == (
+        f"{config_entry.entry_id}_last_poll_latency"
+    )
+    assert device_registry.async_get(device.id).identifiers == {
+        (DOMAIN, config_entry.entry_id)
+    }
+    assert hass.states.get(panel.entity_id) is not None
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+def test_import_time(benchmark_results: dict[str, Any]) -> None:
+    """Importing the integration loads no new dependency and stays in budget."""
+
+    code = f"import {', '.join(PRELOADED)}\nimport {', '.join(INTEGRATION)}"
+    lines = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=Path(__file__).parents[1],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stderr.splitlines()
+
+    # Lines are "import time: self [us] | cumulative | module", after the
+    # modules of the first import statement only the integration's follow.
+    imported: dict[str, int] = {}
+    for line in lines[1:]:
+        self_us, _, module = line.removeprefix("import time:").split("|")
+        imported[module.strip()] = int(self_us)
+    *_, preloaded = PRELOADED
+    names = list(imported)
+    integration = names[names.index(preloaded) + 1 :]
+
+    total = sum(imported[module] for module in integration) / 1_000_000
+    benchmark_results["import_time"] = {
+        "seconds": round(total, 4),
+        "modules": integration,
+    }
+
+    assert [
+        module for module in integration if not module.startswith("custom_components")
+    ] == []
+    assert total < IMPORT_BUDGET
@@ -0,0 +1,132 @@
+"""Tests for the TC20E rate limiter."""
+
+from __future__ import annotations
+
+from collections.abc import Generator
+from datetime import timedelta
+from email.utils import format_datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.tc20e.rate_limiter import (
+    MAX_RETRY_AFTER,
+    RateLimiter,
+    ThrottledError,
+)
+
+
+@pytest.fixture
+def clock() -> Generator[MagicMock, None, None]:
+    """Control the clock of the limiter."""
+    with patch("custom_components.tc20e.rate_limiter.time") as mock_time:
+        mock_time.monotonic.return_value = 1000.0
+        yield mock_time.monotonic
+
+
+@pytest.fixture
+def sleep() -> Generator[AsyncMock, None, None]:
+    """Record waits of the limiter instead of sleeping."""
+    with patch("custom_components.tc20e.rate_limiter.asyncio") as mock_asyncio:
+        mock_asyncio.sleep = AsyncMock()
+        yield mock_asyncio.sleep
+
+
+async def test_burst_then_wait(clock: MagicMock, sleep: AsyncMock) -> None:
+    """A burst is sent right away, then requests wait for a token."""
+
+    limiter = RateLimiter(60, 2)
+
+    await limiter.async_acquire()
+    await limiter.async_acquire()
+    sleep.assert_not_called()
+
+    await limiter.async_acquire()
+    sleep.assert_awaited_once_with(1.0)
+    assert limiter.throttled == 1
+
+    # The token is taken while waiting, the next request queues behind it.
+    await limiter.async_acquire()
+    assert sleep.await_args.args == (2.0,)
+
+    clock.return_value += 10
+    sleep.reset_mock()
+    await limiter.async_acquire()
+    sleep.assert_not_called()
+
+
+async def test_long_wait_fails_fast(clock: MagicMock, sleep: AsyncMock) -> None:
+    """Requests that would wait too long for a token are not sent."""
+
+    limiter = RateLimiter(6, 1)
+    await limiter.async_acquire()
+
+    with pytest.raises(ThrottledError):
+        await limiter.async_acquire()
+
+    sleep.assert_not_called()
+    assert limiter.deferred == 1
+
+    clock.return_value += 10
+    await limiter.async_acquire()
+
+
+@pytest.mark.parametrize("offset", [0, 119.9])
+async def test_retry_after_seconds(
+    clock: MagicMock, sleep: AsyncMock, offset: float
+) -> None:
+    """Requests fail until the Retry-After delay has passed."""
+
+    limiter = RateLimiter(60, 10)
+    limiter.retry_after("120")
+
+    clock.return_value += offset
+    with pytest.raises(ThrottledError):
+        await limiter.async_acquire()
+    assert limiter.as_dict()["blocked_for"] == round(120 - offset, 1)
+
+    clock.return_value += 120 - offset
+    await limiter.async_acquire()
+    sleep.assert_not_called()
+
+
+async def test_retry_after_date(clock: MagicMock, sleep: AsyncMock) -> None:
+    """Retry-After is also accepted as an HTTP date."""
+
+    limiter = RateLimiter(60, 10)
+    limiter.retry_after(format_datetime(dt_util.utcnow() + timedelta(seconds=60)))
+
+    assert 58 <= limiter.as_dict()["blocked_for"] <= 60
+    with pytest.raises(ThrottledError):
+        await limiter.async_acquire()
+
+
+@pytest.mark.parametrize(
+    ("value", "blocked_for"),
+    [("100000", MAX_RETRY_AFTER), ("-5", 0), ("soon", 0)],
+)
+def test_retry_after_bounds(clock: MagicMock, value: str, blocked_for: int) -> None:
+    """Retry-After is capped, invalid values are ignored."""
+
+    limiter = RateLimiter(60, 10)
+    limiter.retry_after(value)
+
+    assert limiter.as_dict()["blocked_for"] == blocked_for
+
+
+def test_configure(clock: MagicMock) -> None:
+    """A smaller burst drops the tokens above it."""
+
+    limiter = RateLimiter(60, 10)
+    limiter.configure(30, 3)
+
+    assert limiter.as_dict() == {
+        "rate_per_minute": 30,
+        "burst": 3,
+        "tokens": 3,
+        "blocked_for": 0,
+        "throttled": 0,
+        "deferred": 0,
+    }
@@ -0,0 +1,186 @@
+"""Regression tests replaying recorded exchanges with the TC20E website.
+
+The cassettes in tests/cassettes were recorded from the fake website. To
+record them from the real one, which arms and disarms the panel:
+
+    TC20E_AUTHENTICATION="Basic ..." pytest tests/test_replay.py \
+        --record-cassettes https://tc20e.total-connect.eu
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+import os
+from pathlib import Path
+import time
+import tracemalloc
+
+import pytest
+
+from homeassistant.const import CONF_AUTHENTICATION
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from custom_components.tc20e.const import STORAGE_KEY, STORAGE_VERSION
+from custom_components.tc20e.coordinator import TC20EUpdateCoordinator
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from . import async_setup_integration
+from .cassette import (
+    SESSION_ID_PLACEHOLDER,
+    Cassette,
+    CassetteRecorder,
+    ReplayTC20E,
+)
+from .conftest import AUTH_ID, SESSION_ID, FakeTC20E, async_serve_website
+from .test_coordinator import _wait_for_commands
+
+CASSETTES = Path(__file__).parent / "cassettes"
+# Replayed flows may take this much longer than recorded.
+LATENCY_MARGIN = 1.5
+LATENCY_SLACK = 0.25
+# Peak memory allocated while a flow runs, the local website included.
+ALLOCATION_BUDGET = 1_000_000
+
+
+async def _command(coordinator: TC20EUpdateCoordinator, command: str) -> None:
+    await coordinator.setalarm(command)
+    await _wait_for_commands(coordinator)
+
+
+FLOWS: dict[str, Callable[[TC20EUpdateCoordinator], Awaitable[None]]] = {
+    "poll": lambda coordinator: coordinator.async_refresh(),
+    "arm": lambda coordinator: _command(coordinator, "full"),
+    "partial_arm": lambda coordinator: _command(coordinator, "partial"),
+    "disarm": lambda coordinator: _command(coordinator, "disarm"),
+}
+# Alarm status of the fake website before each flow is recorded.
+INITIAL_STATUS = {"poll": 100, "arm": 100, "partial_arm": 100, "disarm": 101}
+
+
+async def _async_setup(
+    hass: HomeAssistant, entry: MockConfigEntry
+) -> TC20EUpdateCoordinator:
+    """Login and refresh, without resuming the session of an earlier run."""
+
+    await Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry.entry_id}").async_remove()
+    return await async_setup_integration(hass, entry)
+
+
+async def _async_run_flow(
+    hass: HomeAssistant, entry: MockConfigEntry, flow: str
+) -> None:
+    """Login, refresh, run the flow and unload."""
+
+    coordinator = await _async_setup(hass, entry)
+    await FLOWS[flow](coordinator)
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def _async_record_flow(
+    hass: HomeAssistant,
+    entry: MockConfigEntry,
+    flow: str,
+    upstream: str,
+    path: Path,
+    recorded_from: str = "",
+) -> None:
+    """Run the flow through a recorder to upstream, save its cassette."""
+
+    recorder = CassetteRecorder(upstream, recorded_from)
+    try:
+        async with async_serve_website(recorder.app()):
+            await _async_run_flow(hass, entry, flow)
+    finally:
+        await recorder.async_close()
+    recorder.cassette.save(path)
+
+
+@pytest.fixture
+def entry(hass: HomeAssistant, pytestconfig: pytest.Config) -> MockConfigEntry:
+    """Return a config entry sending every command it is asked to."""
+
+    auth_id = AUTH_ID
+    if pytestconfig.getoption("record_cassettes") not in (None, "fake"):
+        auth_id = os.environ["TC20E_AUTHENTICATION"]
+
+    entry = MockConfigEntry(
+        domain="tc20e",
+        unique_id="user",
+        data={CONF_AUTHENTICATION: auth_id},
+        options={"state_max_age": 0},
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+@pytest.mark.parametrize("flow", FLOWS)
+async def test_replay(
+    hass: HomeAssistant,
+    pytestconfig: pytest.Config,
+    socket_enabled: None,
+    entry: MockConfigEntry,
+    flow: str,
+) -> None:
+    """A flow sends the recorded requests, in time and memory budget."""
+
+    path = CASSETTES / f"{flow}.json"
+
+    if (upstream := pytestconfig.getoption("record_cassettes")) == "fake":
+        fake = FakeTC20E()
+        fake.alarmstatus = INITIAL_STATUS[flow]
+        async with async_serve_website(fake.app()) as url:
+            await _async_record_flow(hass, entry, flow, url, path, "fake")
+    elif upstream is not None:
+        await _async_record_flow(hass, entry, flow, upstream, path)
+
+    cassette = Cassette.load(path)
+    website = ReplayTC20E(cassette)
+
+    async with async_serve_website(website.app()):
+        coordinator = await _async_setup(hass, entry)
+        # Only the flow itself is timed, not logging in and setting up.
+        first = cassette.interactions[len(website.requests)]
+        tracemalloc.start()
+        start = time.monotonic()
+        try:
+            await FLOWS[flow](coordinator)
+            elapsed = time.monotonic() - start
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+    assert website.unexpected == []
+    assert website.requests == cassette.requests
+    assert website.remaining == 0
+    assert coordinator.last_update_success
+    recorded = cassette.duration - first["offset"]
+    assert elapsed < recorded * LATENCY_MARGIN + LATENCY_SLACK
+    assert peak < ALLOCATION_BUDGET
+
+
+async def test_record_sanitizes(
+    hass: HomeAssistant, socket_enabled: None, entry: MockConfigEntry, tmp_path: Path
+) -> None:
+    """Recorded cassettes hold no credentials or session id, and replay."""
+
+    path = tmp_path / "arm.json"
+    fake = FakeTC20E()
+    async with async_serve_website(fake.app()) as url:
+        await _async_record_flow(hass, entry, "arm", url, path)
+
+    text = path.read_text()
+    assert SESSION_ID not in text
+    assert AUTH_ID not in text
+    assert "JSESSIONID" not in text
+    assert SESSION_ID_PLACEHOLDER in text
+
+    cassette = Cassette.load(path)
+    assert cassette.requests == fake.requests
+    website = ReplayTC20E(cassette, speed=0)
+    async with async_serve_website(website.app()):
+        await _async_run_flow(hass, entry, "arm")
+    assert website.requests == cassette.requests
+    assert website.unexpected == []
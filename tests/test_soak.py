@@ -0,0 +1,122 @@
+"""Soak test driving the coordinator against the fake TC20E website.
+
+Run it for longer and keep the results for comparison:
+
+    pytest tests/test_soak.py --soak-duration 3600 --soak-concurrency 20 \
+        --benchmark-latency 0.2 --benchmark-json soak.json
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import logging
+from typing import Any
+import tracemalloc
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.tc20e.api import LIMIT_PER_HOST
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from . import async_setup_integration
+from .conftest import FakeTC20E
+from .load import LoadDriver
+
+# Share of the run before memory is traced, caches and pools fill up.
+WARM_UP = 0.2
+# Kept by the tests on purpose, as the requests the fake website received,
+# or by asyncio debug mode, as where each task was created.
+UNTRACED = ("*/tests/*", "*/traceback.py", "*/reprlib.py", "*/asyncio/events.py")
+
+
+def _traced_memory() -> int:
+    """Return bytes allocated since tracing started and still in use."""
+
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, pattern) for pattern in UNTRACED]
+    )
+    return sum(stat.size for stat in snapshot.statistics("filename"))
+
+
+async def test_soak(
+    hass: HomeAssistant,
+    pytestconfig: pytest.Config,
+    caplog: pytest.LogCaptureFixture,
+    tc20e: FakeTC20E,
+    config_entry: MockConfigEntry,
+    benchmark_results: dict[str, Any],
+) -> None:
+    """Polls and commands run for a while without errors, leaks or slowdown."""
+
+    duration = pytestconfig.getoption("soak_duration")
+    concurrency = pytestconfig.getoption("soak_concurrency")
+    max_p95 = pytestconfig.getoption("soak_max_p95")
+    max_growth = pytestconfig.getoption("soak_max_growth")
+
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options=config_entry.options
+        | {"state_max_age": 0, "rate_limit": 6000, "rate_burst": 100},
+    )
+    # Log records kept by pytest would count as growth.
+    for logger in (None, "aiohttp.access", "asyncio", "custom_components.tc20e"):
+        caplog.set_level(logging.WARNING, logger=logger)
+    tasks = asyncio.all_tasks()
+
+    coordinator = await async_setup_integration(hass, config_entry)
+    tc20e.latency = pytestconfig.getoption("benchmark_latency")
+    driver = LoadDriver(coordinator, tc20e)
+    operations = [
+        driver.async_poll,
+        lambda: driver.async_command("full"),
+        driver.async_poll,
+        lambda: driver.async_command("partial"),
+        driver.async_poll,
+        lambda: driver.async_command("disarm"),
+    ]
+
+    # Growth is measured over the second half, once buffers of recent samples
+    # and events filled up during the first one.
+    run = duration * (1 - WARM_UP) / 2
+    await driver.async_run_for(duration * WARM_UP, operations, concurrency)
+    tracemalloc.start()
+    try:
+        await driver.async_run_for(run, operations, concurrency)
+        middle = _traced_memory()
+        await driver.async_run_for(run, operations, concurrency)
+        growth = _traced_memory() - middle
+    finally:
+        tracemalloc.stop()
+
+    driver.unsub()
+    connector = coordinator.scheduler.connector
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+    # Let the fake website notice its connections were closed.
+    await asyncio.sleep(0.1)
+
+    leaked = [
+        repr(task)
+        for task in asyncio.all_tasks() - tasks
+        if task is not asyncio.current_task() and not task.done()
+    ]
+    report = driver.as_dict()
+    benchmark_results["soak"] = report | {
+        "duration": duration,
+        "concurrency": concurrency,
+        "memory_growth": growth,
+        "leaked_tasks": leaked,
+    }
+
+    assert report["operations"]
+    assert all(stats["errors"] == 0 for stats in report["operations"].values())
+    assert all(stats["p95"] <= max_p95 for stats in report["operations"].values())
+    assert report["max_open_connections"] <= LIMIT_PER_HOST
+    assert connector.closed
+    assert leaked == []
+    assert growth <= max_growth